@@ -1,11 +1,242 @@
+import csv
+import json
+from array import array
+from itertools import compress, islice, repeat
+from operator import eq
+
+
+# Class that stores expenses together with a per-category index and running
+# totals, so totals and category lookups don't have to scan every expense
+class ExpenseStore:
+    def __init__(self):
+        # All expenses in the order they were added
+        self.expenses = []
+        # Category -> list of its expenses (the same dictionaries)
+        self.by_category = {}
+        # Running aggregates: overall total, and sum/count per category
+        self.total = 0
+        self.category_sums = {}
+        self.category_counts = {}
+
+    # Add an expense and update the index and all aggregates
+    def add_expense(self, amount, category):
+        expense = {'amount': amount, 'category': category}
+        self.expenses.append(expense)
+        self.by_category.setdefault(category, []).append(expense)
+        self.total += amount
+        self.category_sums[category] = self.category_sums.get(category, 0) + amount
+        self.category_counts[category] = self.category_counts.get(category, 0) + 1
+
+    # Iterating over the store gives the expenses in insertion order
+    def __iter__(self):
+        return iter(self.expenses)
+
+    def __len__(self):
+        return len(self.expenses)
+
+    # Total of all expenses: O(1)
+    def total_expenses(self):
+        return self.total
+
+    # Expenses of one category, straight from the index: O(result)
+    def filter_expenses_by_category(self, category):
+        return iter(self.by_category.get(category, []))
+
+    # Total of one category: O(1)
+    def category_total(self, category):
+        return self.category_sums.get(category, 0)
+
+    # Sum, count and mean of every category, from the running aggregates
+    def group_by_category(self):
+        return {
+            category: {
+                'sum': self.category_sums[category],
+                'count': count,
+                'mean': self.category_sums[category] / count,
+            }
+            for category, count in self.category_counts.items()
+        }
+
+
+# Class that stores expenses column by column: one float64 array of amounts
+# and one array of category codes, with each category name stored once
+# (dictionary encoding). Millions of rows take about 12 bytes each instead of
+# a dictionary per expense, and totals and filters run over whole columns.
+class ColumnarExpenseStore:
+    def __init__(self):
+        self.amounts = array('d')
+        self.codes = array('I')
+        # Code -> category name, and category name -> code
+        self.categories = []
+        self.category_codes = {}
+        # Running sum and count per category code
+        self.code_sums = array('d')
+        self.code_counts = array('q')
+
+    # Code of a category, adding it to the dictionary on first use
+    def encode(self, category):
+        code = self.category_codes.get(category)
+        if code is None:
+            code = self.category_codes[category] = len(self.categories)
+            self.categories.append(category)
+            self.code_sums.append(0.0)
+            self.code_counts.append(0)
+        return code
+
+    # Add one expense
+    def add_expense(self, amount, category):
+        self.extend([amount], [category])
+
+    # Append a batch of expenses given as an amounts and a categories column.
+    # The batch is checked in full first, so a bad value leaves the store unchanged.
+    def extend(self, amounts, categories):
+        new_amounts = array('d', map(float, amounts))
+        categories = list(categories)
+        if len(categories) != len(new_amounts):
+            raise ValueError('Every expense needs an amount and a category')
+        new_codes = array('I', map(self.encode, categories))
+        self.amounts.extend(new_amounts)
+        self.codes.extend(new_codes)
+        code_sums, code_counts = self.code_sums, self.code_counts
+        for code, amount in zip(new_codes, new_amounts):
+            code_sums[code] += amount
+            code_counts[code] += 1
+
+    def __len__(self):
+        return len(self.amounts)
+
+    # Iterating gives {'amount': ..., 'category': ...} dictionaries, built on the fly
+    def __iter__(self):
+        categories = self.categories
+        return ({'amount': amount, 'category': categories[code]}
+                for amount, code in zip(self.amounts, self.codes))
+
+    # Print every expense, formatting and writing a block of lines at a time
+    def print_expenses(self, block_size=10_000):
+        categories = self.categories
+        for start in range(0, len(self.amounts), block_size):
+            amounts = self.amounts[start:start + block_size]
+            names = map(categories.__getitem__, self.codes[start:start + block_size])
+            print('\n'.join(f'Amount: {amount}, Category: {name}' for amount, name in zip(amounts, names)))
+
+    # Total of all expenses, summed over the amounts column
+    def total_expenses(self):
+        return sum(self.amounts)
+
+    # Positions of the expenses of one category, found by comparing the whole
+    # codes column against the category's code
+    def _positions(self, category):
+        code = self.category_codes.get(category)
+        if code is None:
+            return iter(())
+        return compress(range(len(self.codes)), map(eq, self.codes, repeat(code)))
+
+    # Expenses of one category as dictionaries
+    def filter_expenses_by_category(self, category):
+        amounts = self.amounts
+        return ({'amount': amounts[i], 'category': category} for i in self._positions(category))
+
+    # Amounts of one category as a float64 array
+    def category_amounts(self, category):
+        code = self.category_codes.get(category)
+        if code is None:
+            return array('d')
+        return array('d', compress(self.amounts, map(eq, self.codes, repeat(code))))
+
+    # Total of one category: O(1)
+    def category_total(self, category):
+        code = self.category_codes.get(category)
+        return 0 if code is None else self.code_sums[code]
+
+    # Sum, count and mean of every category
+    def group_by_category(self):
+        return {
+            category: {
+                'sum': self.code_sums[code],
+                'count': self.code_counts[code],
+                'mean': self.code_sums[code] / self.code_counts[code],
+            }
+            for code, category in enumerate(self.categories)
+            if self.code_counts[code]
+        }
+
+
+# Convert the amount of one row, naming the line if it is not a number
+def _parse_amount(value, path, line_number):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{path}, line {line_number}: invalid amount {value!r}') from None
+
+
+# Read rows from a CSV file (with a header row) or a JSONL file (one JSON
+# object per line) and yield (amount, category) pairs. A malformed row raises
+# ValueError with its line number.
+def _read_expense_rows(path, amount_field, category_field):
+    with open(path, newline='') as file:
+        if path.endswith(('.jsonl', '.ndjson')):
+            for line_number, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as error:
+                    raise ValueError(f'{path}, line {line_number}: {error}') from None
+                if not isinstance(row, dict) or not isinstance(row.get(category_field), str):
+                    raise ValueError(f'{path}, line {line_number}: expected an object with '
+                                     f'"{amount_field}" and a text "{category_field}"')
+                yield _parse_amount(row.get(amount_field), path, line_number), row[category_field]
+        else:
+            reader = csv.reader(file)
+            header = next(reader, [])
+            amount_index = header.index(amount_field)
+            category_index = header.index(category_field)
+            fields = max(amount_index, category_index) + 1
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) < fields:
+                    raise ValueError(f'{path}, line {reader.line_num}: expected {len(header)} fields, got {len(row)}')
+                yield _parse_amount(row[amount_index], path, reader.line_num), row[category_index]
+
+
+# Yield the rows of a CSV or JSONL file in chunks of (amounts, categories) columns
+def _read_expense_chunks(path, chunk_size, amount_field, category_field):
+    pairs = _read_expense_rows(path, amount_field, category_field)
+    while True:
+        chunk = list(islice(pairs, chunk_size))
+        if not chunk:
+            return
+        amounts, categories = zip(*chunk)
+        yield amounts, categories
+
+
+# Stream a CSV or JSONL file of expenses into a ColumnarExpenseStore,
+# chunk_size rows at a time. Returns the store.
+def load_expenses(path, store=None, chunk_size=100_000, amount_field='amount', category_field='category'):
+    if store is None:
+        store = ColumnarExpenseStore()
+    for amounts, categories in _read_expense_chunks(path, chunk_size, amount_field, category_field):
+        store.extend(amounts, categories)
+    return store
+
+
 # Function to add an expense (amount + category) to the expenses list
 def add_expense(expenses, amount, category):
+    # The stores keep their index and totals up to date themselves
+    if isinstance(expenses, (ExpenseStore, ColumnarExpenseStore)):
+        expenses.add_expense(amount, category)
+        return
     # Append a dictionary with amount and category into the expenses list
     expenses.append({'amount': amount, 'category': category})
     
 
 # Function to print all expenses
 def print_expenses(expenses):
+    # A columnar store formats whole blocks of its columns at once
+    if isinstance(expenses, ColumnarExpenseStore):
+        expenses.print_expenses()
+        return
     # Loop through each expense dictionary in the list/iterator
     for expense in expenses:
         # Print out amount and category of each expense using f-string
@@ -14,20 +245,26 @@ def print_expenses(expenses):
 
 # Function to calculate total of all expenses
 def total_expenses(expenses):
+    # The stores compute their totals themselves
+    if isinstance(expenses, (ExpenseStore, ColumnarExpenseStore)):
+        return expenses.total_expenses()
     # Use map() to extract only the 'amount' values, then sum() to total them
     return sum(map(lambda expense: expense['amount'], expenses))
     
 
 # Function to filter expenses by a given category
 def filter_expenses_by_category(expenses, category):
+    # The stores look the category up themselves
+    if isinstance(expenses, (ExpenseStore, ColumnarExpenseStore)):
+        return expenses.filter_expenses_by_category(category)
     # Return an iterator of only those expenses where the category matches
     return filter(lambda expense: expense['category'] == category, expenses)
     
 
 # Main function to run the program (menu-driven interface)
 def main():
-    # List to hold all expense entries
-    expenses = []
+    # Columnar store to hold all expense entries
+    expenses = ColumnarExpenseStore()
     
     # Infinite loop to keep showing the menu until user exits
     while True:
@@ -36,7 +273,9 @@ def main():
         print('2. List all expenses')
         print('3. Show total expenses')
         print('4. Filter expenses by category')
-        print('5. Exit')
+        print('5. Show totals by category')
+        print('6. Load expenses from a CSV/JSONL file')
+        print('7. Exit')
        
         # Take user input for menu choice
         choice = input('Enter your choice: ')
@@ -69,10 +308,27 @@ def main():
             # Print only the filtered expenses
             print_expenses(expenses_from_category)
     
-        # If user chooses option 5 -> exit the program
+        # If user chooses option 5 -> show sum/count/mean per category
         elif choice == '5':
+            print('\nTotals by category:')
+            for category, stats in expenses.group_by_category().items():
+                print(f'{category}: total {stats["sum"]}, count {stats["count"]}, average {stats["mean"]:.2f}')
+
+        # If user chooses option 6 -> bulk-load a file
+        elif choice == '6':
+            path = input('Enter file path: ')
+            before = len(expenses)
+            try:
+                load_expenses(path, expenses)
+            except (OSError, ValueError) as error:
+                print(f'Could not load {path}: {error}')
+            print(f'Loaded {len(expenses) - before} expenses.')
+
+        # If user chooses option 7 -> exit the program
+        elif choice == '7':
             print('Exiting the program.')
             break
 
 # Call the main() function to start the program
-main()
+if __name__ == '__main__':
+    main()
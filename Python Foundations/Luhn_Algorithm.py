@@ -1,3 +1,12 @@
+import argparse
+import mmap
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+
 # Luhn Algorithm is a formula to validate a variety of identification numbers.
 # The Luhn algorithm is as follows:
 
@@ -22,10 +31,130 @@ def verify_card_number(card_number):
             number = (number // 10) + (number % 10)
         sum_of_even_digits += number
     total = sum_of_odd_digits + sum_of_even_digits
-    print(total)
     return total % 10 == 0
 
 
+# Batch validation works on bytes with two precomputed lookup tables, so the
+# per-digit work (int(), doubling, digit sums) happens inside bytes.translate
+# and sum() instead of a Python loop:
+# - DIGIT_VALUES maps b'0'..b'9' to the byte values 0..9
+# - DOUBLED_DIGITS maps them to the digit sum of the doubled digit
+DIGITS = b"0123456789"
+DIGIT_VALUES = bytes.maketrans(DIGITS, bytes(range(10)))
+DOUBLED_DIGITS = bytes.maketrans(DIGITS, bytes((2 * d) // 10 + (2 * d) % 10 for d in range(10)))
+# Characters removed before checking: dashes and spaces, like main(), plus line endings
+SEPARATORS = b"- \r\n"
+
+
+def _luhn_valid(number):
+    # Luhn check of a bytes string of digits
+    if not number.isdigit():
+        return False
+    reversed_number = number[::-1]
+    total = sum(reversed_number[::2].translate(DIGIT_VALUES)) + sum(reversed_number[1::2].translate(DOUBLED_DIGITS))
+    return total % 10 == 0
+
+
+def verify_card_numbers(card_numbers):
+    # Check many card numbers (str or bytes) at once; returns one bool per number.
+    # Dashes and spaces are ignored; any other non-digit makes a number invalid.
+    return [
+        _luhn_valid((number.encode() if isinstance(number, str) else number).translate(None, SEPARATORS))
+        for number in card_numbers
+    ]
+
+
+def verify_card_file(path, chunk_size=1024 * 1024):
+    # Stream a file with one card number per line, about chunk_size bytes at a
+    # time, and yield a list of bools (one per line) for every chunk
+    with open(path, "rb") as card_file:
+        while lines := card_file.readlines(chunk_size):
+            yield verify_card_numbers(lines)
+
+
+def _validate_range(path, start, end, block_size=4 * 1024 * 1024):
+    # Worker task: validate the lines in bytes [start, end) of the file,
+    # which begin and end on line boundaries. The worker maps the file itself,
+    # so no card data is sent between processes. Returns the number of
+    # non-blank lines and the byte offsets of the invalid ones.
+    invalid = array("q")
+    lines = 0
+    with open(path, "rb") as card_file, mmap.mmap(card_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        position = start
+        while position < end:
+            # Cut a block of roughly block_size bytes at a line boundary
+            block_end = mapped.find(b"\n", min(position + block_size, end) - 1, end) + 1 or end
+            block = mapped[position:block_end].split(b"\n")
+            if block[-1] == b"":
+                block.pop()
+            offsets = accumulate((len(line) + 1 for line in block), initial=position)
+            for offset, line, valid in zip(offsets, block, verify_card_numbers(block)):
+                if line.translate(None, SEPARATORS):
+                    lines += 1
+                    if not valid:
+                        invalid.append(offset)
+            position = block_end
+    return lines, invalid.tobytes()
+
+
+def _split_on_lines(path, parts):
+    # Byte ranges that divide the file into about equal parts at line starts
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    boundaries = [0]
+    with open(path, "rb") as card_file, mmap.mmap(card_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for part in range(1, parts):
+            newline = mapped.find(b"\n", max(size * part // parts, boundaries[-1]))
+            if newline == -1 or newline + 1 >= size:
+                break
+            boundaries.append(newline + 1)
+    boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def validate_card_file(path, output_path, workers=None, tasks_per_worker=4):
+    # Validate a (possibly multi-GB) file with one card number per line on a
+    # process pool. The file is split on line boundaries, every worker
+    # memory-maps its own ranges, and the byte offsets of the invalid lines
+    # are written to output_path, one per line, in file order.
+    # Returns line and byte counts with the throughput per second.
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    ranges = _split_on_lines(path, workers * tasks_per_worker)
+    summary = {"lines": 0, "invalid": 0, "bytes": os.path.getsize(path)}
+
+    with ProcessPoolExecutor(workers) as executor, open(output_path, "w") as output_file:
+        tasks = [executor.submit(_validate_range, path, start, end) for start, end in ranges]
+        for task in tasks:
+            lines, invalid_bytes = task.result()
+            invalid = array("q")
+            invalid.frombytes(invalid_bytes)
+            summary["lines"] += lines
+            summary["invalid"] += len(invalid)
+            output_file.writelines(f"{offset}\n" for offset in invalid)
+
+    seconds = time.perf_counter() - start_time
+    summary["seconds"] = seconds
+    summary["lines_per_second"] = summary["lines"] / seconds if seconds else 0.0
+    summary["bytes_per_second"] = summary["bytes"] / seconds if seconds else 0.0
+    return summary
+
+
+def validate_main(argv):
+    # Command line: python Luhn_Algorithm.py validate cards.txt invalid.txt
+    parser = argparse.ArgumentParser(prog="Luhn_Algorithm.py validate",
+                                     description="Find the invalid card numbers in a file, in parallel.")
+    parser.add_argument("input", help="file with one card number per line")
+    parser.add_argument("output", help="file to write the byte offsets of invalid lines to")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    summary = validate_card_file(args.input, args.output, args.workers)
+    print(f"{summary['lines']} lines ({summary['invalid']} invalid) in {summary['seconds']:.2f}s: "
+          f"{summary['lines_per_second']:,.0f} lines/sec, {summary['bytes_per_second'] / 1e6:,.1f} MB/sec")
+
+
 def main():
     card_number = "4111-1111-4555-1142"
     card_translation = str.maketrans({"-": "", " ": ""})
@@ -36,4 +165,8 @@ def main():
         print("INVALID!")
 
 
-main()
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["validate"]:
+        validate_main(sys.argv[2:])
+    else:
+        main()
@@ -1,3 +1,15 @@
+import heapq
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array as typed_array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+
 def merge_sort(array):
     if len(array) <= 1:
         return
@@ -33,9 +45,379 @@ def merge_sort(array):
         sorted_index += 1
 
 
+# Runs shorter than this are extended with binary insertion sort before merging
+MIN_RUN = 32
+
+
+def _reverse_range(array, start, end):
+    end -= 1
+    while start < end:
+        array[start], array[end] = array[end], array[start]
+        start += 1
+        end -= 1
+
+
+def _binary_insertion_sort(array, start, sorted_end, end):
+    # array[start:sorted_end] is already sorted; insert the rest one by one
+    for index in range(sorted_end, end):
+        item = array[index]
+        position = bisect_right(array, item, start, index)
+        array[position + 1:index + 1] = array[position:index]
+        array[position] = item
+
+
+def _find_runs(array):
+    # Split the array into sorted runs and return their boundaries.
+    # Non-descending runs are kept as they are, strictly descending runs are
+    # reversed in place (strictly, so equal items never swap order) and short
+    # runs are extended to MIN_RUN items.
+    length = len(array)
+    boundaries = [0]
+    start = 0
+    while start < length:
+        end = start + 1
+        if end < length and array[end] < array[start]:
+            while end < length and array[end] < array[end - 1]:
+                end += 1
+            _reverse_range(array, start, end)
+        else:
+            while end < length and not array[end] < array[end - 1]:
+                end += 1
+
+        if end - start < MIN_RUN and end < length:
+            forced_end = min(length, start + MIN_RUN)
+            _binary_insertion_sort(array, start, end, forced_end)
+            end = forced_end
+        boundaries.append(end)
+        start = end
+    return boundaries
+
+
+def _merge(source, target, start, middle, end):
+    # Stable merge of source[start:middle] and source[middle:end] into target
+    if not source[middle] < source[middle - 1]:
+        # The two runs are already in order
+        target[start:end] = source[start:end]
+        return
+
+    left_index = start
+    right_index = middle
+    sorted_index = start
+    while left_index < middle and right_index < end:
+        if source[right_index] < source[left_index]:
+            target[sorted_index] = source[right_index]
+            right_index += 1
+        else:
+            target[sorted_index] = source[left_index]
+            left_index += 1
+        sorted_index += 1
+
+    if left_index < middle:
+        target[sorted_index:end] = source[left_index:middle]
+    else:
+        target[sorted_index:end] = source[right_index:end]
+
+
+def _merge_runs(array, boundaries):
+    # Merge neighbouring runs pass by pass, moving items back and forth
+    # between the array and a single auxiliary buffer of the same size
+    source, target = array, array[:]
+    while len(boundaries) > 2:
+        merged = [0]
+        for index in range(0, len(boundaries) - 1, 2):
+            start = boundaries[index]
+            if index + 2 < len(boundaries):
+                middle, end = boundaries[index + 1], boundaries[index + 2]
+                _merge(source, target, start, middle, end)
+            else:
+                # Odd run out: copy it over unchanged
+                end = boundaries[index + 1]
+                target[start:end] = source[start:end]
+            merged.append(end)
+        boundaries = merged
+        source, target = target, source
+
+    if source is not array:
+        array[:] = source
+
+
+def merge_sort_bottom_up(array, key=None, reverse=False):
+    # Iterative, stable merge sort that sorts the list in place.
+    # Existing ascending and descending runs are detected first, so nearly
+    # sorted input costs close to O(n). key and reverse work like in sorted().
+    if len(array) <= 1:
+        return
+
+    # Sorting the reversed input ascending and reversing the result keeps
+    # equal items in their original order
+    if reverse:
+        array.reverse()
+
+    if key is None:
+        _merge_runs(array, _find_runs(array))
+    else:
+        # Decorate with the position so equal keys never compare the items
+        decorated = [(key(item), index, item) for index, item in enumerate(array)]
+        _merge_runs(decorated, _find_runs(decorated))
+        for index, entry in enumerate(decorated):
+            array[index] = entry[2]
+
+    if reverse:
+        array.reverse()
+
+
+# Rough per-line cost of holding a line in memory: the bytes object header
+# plus its slot in the list
+LINE_OVERHEAD = sys.getsizeof(b'') + 8
+
+
+def _write_run(lines, directory, stats, buffer_size):
+    # Spill a sorted list of lines to a new temporary run file
+    handle, path = tempfile.mkstemp(suffix='.run', dir=directory)
+    with open(handle, 'wb', buffering=buffer_size) as run_file:
+        for line in lines:
+            run_file.write(line)
+            stats['bytes_written'] += len(line)
+    return path
+
+
+def _read_run(path, stats, buffer_size):
+    with open(path, 'rb', buffering=buffer_size) as run_file:
+        for line in run_file:
+            stats['bytes_read'] += len(line)
+            yield line
+
+
+def _split_into_runs(input_path, directory, memory_limit, key, reverse, stats, buffer_size):
+    # Pass 1: read the input until the memory budget is used up, sort that
+    # chunk with merge_sort_bottom_up and spill it as a run file
+    runs = []
+    chunk = []
+    used = 0
+    with open(input_path, 'rb', buffering=buffer_size) as input_file:
+        for line in input_file:
+            stats['bytes_read'] += len(line)
+            if not line.endswith(b'\n'):
+                line += b'\n'
+            chunk.append(line)
+            used += len(line) + LINE_OVERHEAD
+            if used >= memory_limit:
+                merge_sort_bottom_up(chunk, key=key, reverse=reverse)
+                runs.append(_write_run(chunk, directory, stats, buffer_size))
+                chunk = []
+                used = 0
+    if chunk or not runs:
+        merge_sort_bottom_up(chunk, key=key, reverse=reverse)
+        runs.append(_write_run(chunk, directory, stats, buffer_size))
+    return runs
+
+
+def external_merge_sort(input_path, output_path, memory_limit=64 * 1024 * 1024, key=None,
+                        reverse=False, fan_in=64, buffer_size=1024 * 1024, temp_dir=None):
+    # Sort the lines of a file that may be larger than RAM and stream them to
+    # output_path. Lines are bytes, so use e.g. key=float for a file of numbers.
+    # At most memory_limit bytes of lines are held at once; runs are merged
+    # fan_in at a time with a heap (heapq.merge), which keeps the sort stable.
+    # Returns statistics: the number of runs, the number of passes over the
+    # data, and the bytes read and written including temporary files.
+    stats = {'runs': 0, 'passes': 1, 'bytes_read': 0, 'bytes_written': 0}
+    with tempfile.TemporaryDirectory(dir=temp_dir) as directory:
+        runs = _split_into_runs(input_path, directory, memory_limit, key, reverse, stats, buffer_size)
+        stats['runs'] = len(runs)
+
+        # Intermediate passes while there are too many runs to open at once
+        while len(runs) > fan_in:
+            merged_runs = []
+            for index in range(0, len(runs), fan_in):
+                group = runs[index:index + fan_in]
+                readers = [_read_run(path, stats, buffer_size) for path in group]
+                merged = heapq.merge(*readers, key=key, reverse=reverse)
+                merged_runs.append(_write_run(merged, directory, stats, buffer_size))
+                for path in group:
+                    os.remove(path)
+            runs = merged_runs
+            stats['passes'] += 1
+
+        # Final pass: merge the remaining runs straight into the output file
+        readers = [_read_run(path, stats, buffer_size) for path in runs]
+        with open(output_path, 'wb', buffering=buffer_size) as output_file:
+            for line in heapq.merge(*readers, key=key, reverse=reverse):
+                output_file.write(line)
+                stats['bytes_written'] += len(line)
+        stats['passes'] += 1
+    return stats
+
+
+# Single-character buffer formats handled by the shared-memory fast path
+TYPED_FORMATS = set('bBhHiIlLqQfd')
+
+# Views of the two shared buffers (data and scratch) of a parallel sort, set
+# in each worker by _attach_shared_buffers
+_shared_buffers = None
+
+
+def _attach_shared_buffers(name, typecode, length):
+    global _shared_buffers
+    block = shared_memory.SharedMemory(name=name)
+    view = block.buf.cast(typecode)
+    _shared_buffers = (block, view[:length], view[length:])
+
+
+def _sort_shared_chunk(start, end):
+    # Sort one chunk of the shared data buffer in place. Typed numbers compare
+    # natively, so the chunk is sorted by the built-in sort (also a stable
+    # merge sort) on a temporary list.
+    _, data, _ = _shared_buffers
+    chunk = data[start:end].tolist()
+    chunk.sort()
+    data[start:end] = typed_array(data.format, chunk)
+
+
+def _merge_shared_runs(source_index, start, middle, end):
+    # Merge two neighbouring sorted runs of one shared buffer into the other.
+    # Sorting the concatenation of two sorted runs makes the built-in sort do
+    # a single linear merge.
+    buffers = _shared_buffers[1:]
+    source, target = buffers[source_index], buffers[1 - source_index]
+    merged = source[start:middle].tolist() + source[middle:end].tolist()
+    merged.sort()
+    target[start:end] = typed_array(source.format, merged)
+
+
+def _copy_shared_run(source_index, start, end):
+    buffers = _shared_buffers[1:]
+    buffers[1 - source_index][start:end] = buffers[source_index][start:end]
+
+
+def _sort_chunk(chunk):
+    merge_sort_bottom_up(chunk)
+    return chunk
+
+
+def _merge_pair(left, right):
+    combined = left + right
+    merged = combined[:]
+    _merge(combined, merged, 0, len(left), len(combined))
+    return merged
+
+
+def _chunk_boundaries(length, chunks):
+    return [length * index // chunks for index in range(chunks + 1)]
+
+
+def _parallel_sort_typed(view, workers, chunks):
+    # Sort a typed buffer through shared memory: the values are copied once
+    # into a block holding a data and a scratch buffer, the workers sort the
+    # chunks in place and then merge pairs of runs round by round, moving
+    # between the two buffers, and the result is copied back.
+    length = len(view)
+    boundaries = _chunk_boundaries(length, chunks)
+    block = shared_memory.SharedMemory(create=True, size=2 * view.nbytes)
+    try:
+        block.buf[:view.nbytes] = view.cast('B')
+        with ProcessPoolExecutor(workers, initializer=_attach_shared_buffers,
+                                 initargs=(block.name, view.format, length)) as executor:
+            list(executor.map(_sort_shared_chunk, boundaries[:-1], boundaries[1:]))
+
+            source_index = 0
+            while len(boundaries) > 2:
+                tasks = []
+                merged = [0]
+                for index in range(0, len(boundaries) - 1, 2):
+                    start = boundaries[index]
+                    if index + 2 < len(boundaries):
+                        middle, end = boundaries[index + 1], boundaries[index + 2]
+                        tasks.append(executor.submit(_merge_shared_runs, source_index, start, middle, end))
+                    else:
+                        end = boundaries[index + 1]
+                        tasks.append(executor.submit(_copy_shared_run, source_index, start, end))
+                    merged.append(end)
+                for task in tasks:
+                    task.result()
+                boundaries = merged
+                source_index = 1 - source_index
+
+        offset = source_index * view.nbytes
+        view.cast('B')[:] = block.buf[offset:offset + view.nbytes]
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _parallel_sort_objects(array, workers, chunks):
+    # Generic path for lists of any comparable items: the chunks are pickled
+    # to the workers, sorted with merge_sort_bottom_up and merged pairwise
+    with ProcessPoolExecutor(workers) as executor:
+        boundaries = _chunk_boundaries(len(array), chunks)
+        runs = list(executor.map(_sort_chunk, [array[start:end] for start, end in zip(boundaries, boundaries[1:])]))
+        while len(runs) > 1:
+            merged = list(executor.map(_merge_pair, runs[0:-1:2], runs[1::2]))
+            if len(runs) % 2:
+                merged.append(runs[-1])
+            runs = merged
+    array[:] = runs[0]
+
+
+def parallel_merge_sort(array, workers=None, min_chunk=10_000):
+    # Sort in place using several worker processes: chunks of at least
+    # min_chunk items are sorted in parallel, then pairs of sorted chunks are
+    # merged in parallel until one run is left.
+    # Typed numeric buffers (array('d'), array('q'), NumPy arrays, ...) take a
+    # fast path through shared memory; lists are sent to the workers in chunks.
+    workers = workers or os.cpu_count() or 1
+    chunks = min(workers, len(array) // min_chunk)
+    try:
+        view = memoryview(array)
+    except TypeError:
+        view = None
+    typed = view is not None and view.ndim == 1 and view.c_contiguous and view.format in TYPED_FORMATS
+
+    if chunks > 1 and typed:
+        _parallel_sort_typed(view, workers, chunks)
+    elif chunks > 1:
+        _parallel_sort_objects(array, workers, chunks)
+    elif typed:
+        values = view.tolist()
+        values.sort()
+        view[:] = typed_array(view.format, values)
+    else:
+        merge_sort_bottom_up(array)
+
+
+def benchmark_parallel(length=5_000_000, max_workers=None, seed=0):
+    # Time parallel_merge_sort on random doubles with 1, 2, 4, ... workers
+    max_workers = max_workers or os.cpu_count() or 1
+    rng = random.Random(seed)
+    values = typed_array('d', (rng.random() for _ in range(length)))
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != max_workers:
+        worker_counts.append(max_workers)
+
+    print(f'{length} doubles')
+    print(f'{"workers":>8} {"seconds":>10} {"speedup":>8}')
+    baseline = None
+    for workers in worker_counts:
+        data = typed_array('d', values)
+        start_time = time.perf_counter()
+        parallel_merge_sort(data, workers)
+        elapsed = time.perf_counter() - start_time
+        baseline = baseline or elapsed
+        print(f'{workers:>8} {elapsed:>10.3f} {baseline / elapsed:>8.2f}')
+
+
 if __name__ == '__main__':
+    if sys.argv[1:] == ['benchmark']:
+        benchmark_parallel()
+        sys.exit()
+
     numbers = [4, 10, 6, 14, 2, 1, 8, 5]
     print('Unsorted array: ')
     print(numbers)
     merge_sort(numbers)
     print('Sorted array: ' + str(numbers))
+
+    words = ['pear', 'fig', 'apple', 'kiwi', 'plum', 'banana']
+    merge_sort_bottom_up(words, key=len, reverse=True)
+    print('Words by length, longest first: ' + str(words))
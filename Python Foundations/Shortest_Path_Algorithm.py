@@ -1,3 +1,18 @@
+import heapq    # Binary heap used as the priority queue of the Dijkstra engine
+import json     # Node labels of saved compact graphs
+import mmap     # Memory-mapped reloads of saved compact graphs
+import os       # CPU count for the process pool
+import random   # Random sparse graphs for the benchmark
+import struct   # Header of the compact graph file format
+import sys      # Command-line switch for the benchmark
+import time     # Wall-clock timing for the benchmark
+from array import array  # Typed arrays behind the compact graph
+from collections import deque  # Queue of in-flight batch tasks
+from collections.abc import Mapping  # Base class of the lazy paths mapping
+from concurrent.futures import ProcessPoolExecutor  # Parallel batch queries
+from itertools import count  # Tie-breakers for heap entries with equal distances
+from multiprocessing import shared_memory  # Graph shared with the workers
+
 # Define a weighted graph using an adjacency list.
 # Each key is a node, and its value is a list of (neighbor, distance) tuples.
 my_graph = {
@@ -9,9 +24,10 @@ my_graph = {
     'F': [('B', 2), ('D', 3)]
 }
 
-# Function to compute the shortest path from a start node to all others.
-# This is a variant of Dijkstra's algorithm.
-def shortest_path(graph, start, target = ''):
+# Original engine: a variant of Dijkstra's algorithm that scans the unvisited
+# list for the closest node on every step, which makes it O(V²).
+# Like every engine it records the number of expanded nodes in stats, if given.
+def _scan_engine(graph, start, target='', stats=None):
     # Keep track of unvisited nodes
     unvisited = list(graph)
 
@@ -46,17 +62,622 @@ def shortest_path(graph, start, target = ''):
 
         # Mark the current node as visited
         unvisited.remove(current)
-    
-    # Decide which nodes to print results for
-    targets_to_print = [target] if target else graph
-    for node in targets_to_print:
-        if node == start:
+
+    if stats is not None:
+        stats['expanded'] = len(graph)
+    return distances, paths
+
+
+# Core of the priority-queue engine: Dijkstra's algorithm on a binary heap,
+# O((V + E) log V). Stale heap entries are skipped when popped (lazy deletion)
+# instead of being removed when a shorter distance is found.
+# Yields (node, distance) as each node is settled and records a single
+# predecessor per node instead of a copy of the whole path.
+def _dijkstra(graph, start, distances, predecessors):
+    infinity = float('inf')
+    distances[start] = 0
+
+    # Heap of (distance, tie-breaker, node) entries and the set of settled
+    # nodes. The tie-breaker keeps equal distances from comparing node labels,
+    # which may be of mixed or unorderable types.
+    tie_breaker = count()
+    queue = [(0, next(tie_breaker), start)]
+    settled = set()
+
+    while queue:
+        # Pop the closest node; skip it if a shorter entry already settled it
+        dist, _, current = heapq.heappop(queue)
+        if current in settled:
+            continue
+        settled.add(current)
+        yield current, dist
+
+        # Relax every edge leaving the current node
+        for node, distance in graph[current]:
+            new_dist = dist + distance
+            if new_dist < distances.get(node, infinity):
+                distances[node] = new_dist
+                predecessors[node] = current
+                heapq.heappush(queue, (new_dist, next(tie_breaker), node))
+
+
+# Rebuild the path from start to node by walking the predecessor map backwards.
+# Returns an empty list if node was never reached.
+def build_path(predecessors, start, node):
+    if node != start and node not in predecessors:
+        return []
+    path = [node]
+    while node != start:
+        node = predecessors[node]
+        path.append(node)
+    path.reverse()
+    return path
+
+
+# Read-only mapping of node -> path that only builds a path when it is asked
+# for, so a run stores one predecessor per node instead of one list per node.
+class LazyPaths(Mapping):
+    def __init__(self, nodes, predecessors, start):
+        self.nodes = nodes
+        self.predecessors = predecessors
+        self.start = start
+
+    def __getitem__(self, node):
+        if node not in self.nodes:
+            raise KeyError(node)
+        return build_path(self.predecessors, self.start, node)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+# Streaming mode: yield (node, distance) in order of increasing distance as
+# each node is settled. The caller can stop iterating at any point; no paths
+# are kept.
+def iter_settled(graph, start):
+    return _dijkstra(graph, start, {}, {})
+
+
+# Run Dijkstra's algorithm and return (distances, predecessors).
+# If a target is given the search stops as soon as the target is settled;
+# distances of nodes that were not settled by then are only upper bounds.
+def shortest_path_tree(graph, start, target='', stats=None):
+    distances = {node: float('inf') for node in graph}
+    predecessors = {}
+    expanded = 0
+    for node, _ in _dijkstra(graph, start, distances, predecessors):
+        expanded += 1
+        # Early exit: the target's distance is final once it is settled
+        if node == target:
+            break
+    if stats is not None:
+        stats['expanded'] = expanded
+    return distances, predecessors
+
+
+# Priority-queue engine: paths are rebuilt lazily from the predecessor map.
+def _heap_engine(graph, start, target='', stats=None):
+    distances, predecessors = shortest_path_tree(graph, start, target, stats)
+    return distances, LazyPaths(graph, predecessors, start)
+
+
+# A* engine for point-to-point queries. heuristic(node, target) must never
+# overestimate the remaining distance (it is admissible), e.g. the straight-
+# line distance between coordinates attached to the nodes. Heap entries are
+# ordered by distance + heuristic, so the search heads towards the target.
+# A node is expanded again if a shorter route to it turns up, which keeps the
+# result exact for admissible heuristics that are not consistent.
+# Only the distance and path to the target are final.
+def _astar_engine(graph, start, target='', stats=None, heuristic=None):
+    if target == '':
+        raise ValueError('The astar engine needs a target')
+    if heuristic is None:
+        raise ValueError('The astar engine needs a heuristic')
+
+    distances = {node: float('inf') for node in graph}
+    distances[start] = 0
+    predecessors = {}
+    # Entries are (distance + heuristic, distance, tie-breaker, node)
+    tie_breaker = count()
+    queue = [(heuristic(start, target), 0, next(tie_breaker), start)]
+    expanded = 0
+
+    while queue:
+        _, dist, _, current = heapq.heappop(queue)
+        # Skip entries made stale by a shorter route found later
+        if dist > distances[current]:
             continue
-        # Print both distance and path from start to this node
-        print(f'\n{start}-{node} distance: {distances[node]}\nPath: {" -> ".join(paths[node])}')
+        expanded += 1
+        if current == target:
+            break
+
+        for node, distance in graph[current]:
+            new_dist = dist + distance
+            if new_dist < distances[node]:
+                distances[node] = new_dist
+                predecessors[node] = current
+                heapq.heappush(queue, (new_dist + heuristic(node, target), new_dist, next(tie_breaker), node))
+
+    if stats is not None:
+        stats['expanded'] = expanded
+    return distances, LazyPaths(graph, predecessors, start)
+
+
+# Bidirectional Dijkstra engine for point-to-point queries on undirected
+# graphs such as my_graph. One search grows from the start and one from the
+# target, always advancing the side with the smaller frontier distance, and
+# both stop once the two frontier distances add up to at least the best
+# start-target distance seen where the searches meet.
+# Only the distance and path to the target (and the nodes on that path) are
+# final.
+def _bidirectional_engine(graph, start, target='', stats=None):
+    if target == '':
+        raise ValueError('The bidirectional engine needs a target')
+
+    infinity = float('inf')
+    # Index 0 holds the forward search, index 1 the backward search
+    dists = ({start: 0}, {target: 0})
+    preds = ({}, {})
+    # Entries are (distance, tie-breaker, node), as in _dijkstra
+    tie_breaker = count()
+    queues = ([(0, next(tie_breaker), start)], [(0, next(tie_breaker), target)])
+    settled = (set(), set())
+    best, meet = (0, start) if start == target else (infinity, None)
+    expanded = 0
+
+    while queues[0] and queues[1]:
+        # Stop once no remaining pair of frontier nodes can improve the best
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        dist, _, current = heapq.heappop(queues[side])
+        if current in settled[side]:
+            continue
+        settled[side].add(current)
+        expanded += 1
+
+        distances, other_distances = dists[side], dists[1 - side]
+        for node, distance in graph[current]:
+            new_dist = dist + distance
+            if new_dist < distances.get(node, infinity):
+                distances[node] = new_dist
+                preds[side][node] = current
+                heapq.heappush(queues[side], (new_dist, next(tie_breaker), node))
+            # Check whether the searches meet at this node with a shorter route
+            if node in other_distances and distances[node] + other_distances[node] < best:
+                best = distances[node] + other_distances[node]
+                meet = node
+
+    # Forward distances and predecessors, completed along the backward half
+    # of the best path so the path to the target can be rebuilt lazily
+    distances = {node: infinity for node in graph}
+    distances.update(dists[0])
+    predecessors = preds[0]
+    if meet is not None:
+        node = meet
+        while node != target:
+            next_node = preds[1][node]
+            predecessors[next_node] = node
+            distances[next_node] = best - dists[1][next_node]
+            node = next_node
+
+    if stats is not None:
+        stats['expanded'] = expanded
+    return distances, LazyPaths(graph, predecessors, start)
+
+
+# Available engines for shortest_path, selected by name
+ENGINES = {
+    'scan': _scan_engine,
+    'heap': _heap_engine,
+    'astar': _astar_engine,
+    'bidirectional': _bidirectional_engine,
+}
+
+
+# Function to compute the shortest path from a start node to all others.
+# The work is done by one of the ENGINES; 'heap' is the default.
+# Extra keyword options (stats, heuristic) are passed on to the engine.
+# Set verbose=False to skip printing the results.
+def shortest_path(graph, start, target = '', engine='heap', verbose=True, **options):
+    distances, paths = ENGINES[engine](graph, start, target, **options)
+
+    if verbose:
+        # Decide which nodes to print results for
+        targets_to_print = [target] if target else graph
+        for node in targets_to_print:
+            if node == start:
+                continue
+            # Print both distance and path from start to this node
+            print(f'\n{start}-{node} distance: {distances[node]}\nPath: {" -> ".join(paths[node])}')
     
     # Return results so they can be used later if needed
     return distances, paths
-    
-# Example: find shortest paths starting from 'F'
-shortest_path(my_graph, 'F')
+
+
+# Compact graph stored in CSR (compressed sparse row) form.
+# Node labels are interned to integer ids 0..n-1 and the edges live in three
+# flat arrays: offsets (n + 1 entries), neighbor ids and weights. The edges of
+# node i are neighbors[offsets[i]:offsets[i + 1]], which costs 16 bytes per
+# edge instead of a tuple plus two objects. Lookups by label return the same
+# (neighbor, distance) list as my_graph, so shortest_path works unchanged.
+class CompactGraph(Mapping):
+    # Binary file layout: header, offsets, neighbors, weights, labels
+    # (a JSON list)
+    MAGIC = b'CSRG'
+    VERSION = 2
+    HEADER = struct.Struct('<4sIqqq')
+
+    def __init__(self, labels, offsets, neighbors, weights):
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.weights = weights
+        self._mmap = None
+
+    # Build from an adjacency dict such as my_graph
+    @classmethod
+    def from_dict(cls, graph):
+        return cls.from_edges(
+            ((node, neighbor, distance) for node, edges in graph.items() for neighbor, distance in edges),
+            nodes=graph,
+        )
+
+    # Build from an iterable of (source, target, weight) edges.
+    # Set undirected=True to also add every edge in the reverse direction.
+    @classmethod
+    def from_edges(cls, edges, nodes=(), undirected=False):
+        labels = []
+        index = {}
+
+        # Intern a label to an integer id
+        def intern(label):
+            node_id = index.get(label)
+            if node_id is None:
+                node_id = index[label] = len(labels)
+                labels.append(label)
+            return node_id
+
+        for label in nodes:
+            intern(label)
+
+        # Collect the edges as flat typed columns (24 bytes per edge)
+        sources = array('q')
+        targets = array('q')
+        edge_weights = array('d')
+        for source, target, weight in edges:
+            u, v = intern(source), intern(target)
+            sources.append(u)
+            targets.append(v)
+            edge_weights.append(weight)
+            if undirected:
+                sources.append(v)
+                targets.append(u)
+                edge_weights.append(weight)
+
+        # Counting sort of the edges by source gives the CSR arrays
+        n = len(labels)
+        offsets = array('q', bytes(8 * (n + 1)))
+        for u in sources:
+            offsets[u + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        position = array('q', offsets[:n])
+        neighbors = array('q', bytes(8 * len(targets)))
+        weights = array('d', bytes(8 * len(targets)))
+        for u, v, weight in zip(sources, targets, edge_weights):
+            slot = position[u]
+            neighbors[slot] = v
+            weights[slot] = weight
+            position[u] = slot + 1
+        return cls(labels, offsets, neighbors, weights)
+
+    # Stream-load a text edge list with one "source target weight" line per
+    # edge. Blank lines and lines starting with '#' are skipped; a missing
+    # weight counts as 1.
+    @classmethod
+    def from_edge_list(cls, filename, undirected=False, delimiter=None):
+        def read_edges():
+            with open(filename, encoding='utf-8') as file:
+                for line in file:
+                    fields = line.split(delimiter)
+                    if not fields or fields[0].startswith('#'):
+                        continue
+                    weight = float(fields[2]) if len(fields) > 2 else 1.0
+                    yield fields[0], fields[1], weight
+
+        return cls.from_edges(read_edges(), undirected=undirected)
+
+    # Write the graph in the binary form read back by load().
+    # Labels must survive a JSON round trip (strings, ints, floats, ...).
+    def save(self, filename):
+        label_text = json.dumps(list(self.labels))
+        if json.loads(label_text) != list(self.labels):
+            raise ValueError('Only JSON-compatible node labels such as str and int can be saved')
+        label_bytes = label_text.encode('utf-8')
+        with open(filename, 'wb') as file:
+            file.write(self.HEADER.pack(self.MAGIC, self.VERSION, len(self.labels),
+                                        len(self.neighbors), len(label_bytes)))
+            file.write(bytes(self.offsets))
+            file.write(bytes(self.neighbors))
+            file.write(bytes(self.weights))
+            file.write(label_bytes)
+
+    # Memory-map a file written by save(). The edge arrays are read straight
+    # from the page cache, so reloading does not parse or copy them.
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n, m, label_len = cls.HEADER.unpack_from(mapped)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            mapped.close()
+            raise ValueError(f'{filename} is not a CompactGraph file')
+
+        view = memoryview(mapped)
+        start = cls.HEADER.size
+        offsets = view[start:start + 8 * (n + 1)].cast('q')
+        start += 8 * (n + 1)
+        neighbors = view[start:start + 8 * m].cast('q')
+        start += 8 * m
+        weights = view[start:start + 8 * m].cast('d')
+        start += 8 * m
+        labels = json.loads(bytes(view[start:start + label_len]).decode('utf-8'))
+
+        graph = cls(labels, offsets, neighbors, weights)
+        graph._mmap = mapped
+        return graph
+
+    # Edges of a node as a list of (neighbor, distance) tuples, like my_graph
+    def __getitem__(self, label):
+        node_id = self.index[label]
+        begin, end = self.offsets[node_id], self.offsets[node_id + 1]
+        labels = self.labels
+        return [(labels[v], w) for v, w in zip(self.neighbors[begin:end], self.weights[begin:end])]
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __contains__(self, label):
+        return label in self.index
+
+
+# Single-source Dijkstra over raw CSR arrays, working on integer ids only.
+# Returns the distances to every node as an array('d'); unreachable nodes
+# stay at infinity.
+def _csr_distances(offsets, neighbors, weights, source):
+    distances = array('d', [float('inf')]) * (len(offsets) - 1)
+    distances[source] = 0.0
+    settled = bytearray(len(offsets) - 1)
+    queue = [(0.0, source)]
+
+    while queue:
+        dist, current = heapq.heappop(queue)
+        if settled[current]:
+            continue
+        settled[current] = 1
+        for slot in range(offsets[current], offsets[current + 1]):
+            node = neighbors[slot]
+            new_dist = dist + weights[slot]
+            if new_dist < distances[node]:
+                distances[node] = new_dist
+                heapq.heappush(queue, (new_dist, node))
+    return distances
+
+
+# CSR arrays of the graph shared with the worker processes, set by
+# _attach_shared_graph in each worker.
+_shared_graph = None
+
+
+# Worker initializer: map the CSR arrays from the shared memory block created
+# by the parent instead of receiving a pickled copy of the graph.
+def _attach_shared_graph(name, n, m):
+    global _shared_graph
+    block = shared_memory.SharedMemory(name=name)
+    view = block.buf
+    offsets = view[:8 * (n + 1)].cast('q')
+    neighbors = view[8 * (n + 1):8 * (n + 1 + m)].cast('q')
+    weights = view[8 * (n + 1 + m):8 * (n + 1 + 2 * m)].cast('d')
+    _shared_graph = (block, offsets, neighbors, weights)
+
+
+# Worker task: distance rows for a chunk of source ids, restricted to the
+# target ids if given, returned as raw float64 bytes.
+def _distance_rows(source_ids, target_ids):
+    _, offsets, neighbors, weights = _shared_graph
+    rows = array('d')
+    for source in source_ids:
+        distances = _csr_distances(offsets, neighbors, weights, source)
+        if target_ids is None:
+            rows.extend(distances)
+        else:
+            rows.extend(distances[target] for target in target_ids)
+    return rows.tobytes()
+
+
+# Resolve the graph and the source/target labels of a batch query to a
+# CompactGraph and integer ids. Returns (graph, source_ids, target_ids, columns).
+def _prepare_batch(graph, sources, targets):
+    if not isinstance(graph, CompactGraph):
+        graph = CompactGraph.from_dict(graph)
+    source_ids = [graph.index[source] for source in (graph if sources is None else sources)]
+    target_ids = None if targets is None else [graph.index[target] for target in targets]
+    columns = len(graph) if target_ids is None else len(target_ids)
+    return graph, source_ids, target_ids, columns
+
+
+# Run the sources through a process pool and yield the distance rows in
+# source order, in blocks of up to block_rows rows as raw float64 bytes.
+# The graph is copied once into shared memory; only the ids of each block
+# travel to the workers. At most two blocks per worker are in flight.
+def _iter_distance_blocks(graph, source_ids, target_ids, workers, block_rows):
+    workers = workers or os.cpu_count() or 1
+    n, m = len(graph.labels), len(graph.neighbors)
+
+    block = shared_memory.SharedMemory(create=True, size=max(1, 8 * (n + 1 + 2 * m)))
+    try:
+        block.buf[:8 * (n + 1)] = bytes(graph.offsets)
+        block.buf[8 * (n + 1):8 * (n + 1 + m)] = bytes(graph.neighbors)
+        block.buf[8 * (n + 1 + m):8 * (n + 1 + 2 * m)] = bytes(graph.weights)
+
+        with ProcessPoolExecutor(workers, initializer=_attach_shared_graph,
+                                 initargs=(block.name, n, m)) as executor:
+            in_flight = deque()
+            for begin in range(0, len(source_ids), block_rows):
+                chunk = source_ids[begin:begin + block_rows]
+                in_flight.append(executor.submit(_distance_rows, chunk, target_ids))
+                if len(in_flight) >= 2 * workers:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+    finally:
+        block.close()
+        block.unlink()
+
+
+# Distances from many sources at once, spread over a process pool.
+# Returns a dense matrix as a list of array('d') rows: one row per source
+# (every node if sources is None) and one column per target (every node in
+# graph order if targets is None). Nothing is printed.
+def distance_matrix(graph, sources=None, targets=None, workers=None, block_rows=64):
+    graph, source_ids, target_ids, columns = _prepare_batch(graph, sources, targets)
+    if columns == 0:
+        return [array('d') for _ in source_ids]
+    matrix = []
+    for data in _iter_distance_blocks(graph, source_ids, target_ids, workers, block_rows):
+        rows = array('d')
+        rows.frombytes(data)
+        matrix.extend(rows[begin:begin + columns] for begin in range(0, len(rows), columns))
+    return matrix
+
+
+# Same as distance_matrix, but each block of rows is written straight to
+# filename as row-major float64 values, so the full matrix never has to fit
+# in memory. Returns the (rows, columns) shape of the written matrix.
+def write_distance_matrix(graph, filename, sources=None, targets=None, workers=None, block_rows=256):
+    graph, source_ids, target_ids, columns = _prepare_batch(graph, sources, targets)
+    with open(filename, 'wb') as file:
+        if columns == 0:
+            return len(source_ids), 0
+        for data in _iter_distance_blocks(graph, source_ids, target_ids, workers, block_rows):
+            file.write(data)
+    return len(source_ids), columns
+
+
+# Build a random sparse graph with integer nodes 0..n-1.
+# A random spanning tree keeps it connected, then extra random edges are added
+# until every node has about avg_degree neighbors. Edges are undirected.
+def random_graph(n, avg_degree=4, max_weight=100, seed=0):
+    rng = random.Random(seed)
+    graph = {node: [] for node in range(n)}
+
+    def add_edge(u, v):
+        weight = rng.randint(1, max_weight)
+        graph[u].append((v, weight))
+        graph[v].append((u, weight))
+
+    for node in range(1, n):
+        add_edge(node, rng.randrange(node))
+    for _ in range(max(0, n * avg_degree // 2 - (n - 1))):
+        add_edge(rng.randrange(n), rng.randrange(n))
+    return graph
+
+
+# Compare the engines on random sparse graphs of increasing size.
+# The quadratic 'scan' engine is skipped above scan_limit nodes, where a
+# single run would take hours.
+def benchmark(sizes=(1_000, 10_000, 100_000, 1_000_000), avg_degree=4, scan_limit=20_000, seed=0):
+    print(f'{"nodes":>10} {"engine":>8} {"seconds":>10}')
+    for n in sizes:
+        graph = random_graph(n, avg_degree, seed=seed)
+        for engine in ENGINES:
+            if engine == 'scan' and n > scan_limit:
+                print(f'{n:>10} {engine:>8} {"skipped":>10}')
+                continue
+            start_time = time.perf_counter()
+            shortest_path(graph, 0, engine=engine, verbose=False)
+            elapsed = time.perf_counter() - start_time
+            print(f'{n:>10} {engine:>8} {elapsed:>10.3f}')
+
+
+# Heuristic for the astar engine: straight-line distance between the
+# (x, y) coordinates of two nodes. It is admissible as long as no edge is
+# shorter than the straight line between its endpoints.
+def euclidean_heuristic(coordinates):
+    def heuristic(node, target):
+        (x1, y1), (x2, y2) = coordinates[node], coordinates[target]
+        return ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
+    return heuristic
+
+
+# Build a road-network-like undirected graph: a side x side grid of nodes
+# with jittered coordinates, where every edge weighs its straight-line length
+# times a random detour factor between 1 and 1.5.
+# Returns (graph, coordinates).
+def grid_graph(side, seed=0):
+    rng = random.Random(seed)
+    coordinates = {
+        row * side + col: (col + rng.uniform(-0.3, 0.3), row + rng.uniform(-0.3, 0.3))
+        for row in range(side) for col in range(side)
+    }
+    graph = {node: [] for node in coordinates}
+    line = euclidean_heuristic(coordinates)
+
+    for row in range(side):
+        for col in range(side):
+            node = row * side + col
+            for neighbor in ((node + 1) if col + 1 < side else None, (node + side) if row + 1 < side else None):
+                if neighbor is None:
+                    continue
+                weight = line(node, neighbor) * rng.uniform(1, 1.5)
+                graph[node].append((neighbor, weight))
+                graph[neighbor].append((node, weight))
+    return graph, coordinates
+
+
+# Compare the point-to-point engines on random queries over a grid graph:
+# average nodes expanded and wall time per query, against the full-graph
+# 'heap' run without a target.
+def benchmark_point_to_point(side=300, queries=20, seed=0):
+    graph, coordinates = grid_graph(side, seed)
+    heuristic = euclidean_heuristic(coordinates)
+    rng = random.Random(seed)
+    pairs = [(rng.randrange(len(graph)), rng.randrange(len(graph))) for _ in range(queries)]
+    runs = {
+        'full': lambda start, target: shortest_path(graph, start, verbose=False, stats=stats),
+        'heap': lambda start, target: shortest_path(graph, start, target, verbose=False, stats=stats),
+        'astar': lambda start, target: shortest_path(graph, start, target, 'astar', verbose=False,
+                                                     stats=stats, heuristic=heuristic),
+        'bidirectional': lambda start, target: shortest_path(graph, start, target, 'bidirectional',
+                                                             verbose=False, stats=stats),
+    }
+
+    print(f'{len(graph)} nodes, {queries} queries')
+    print(f'{"engine":>14} {"expanded":>10} {"ms/query":>10}')
+    for name, run in runs.items():
+        stats = {}
+        expanded = 0
+        start_time = time.perf_counter()
+        for start, target in pairs:
+            run(start, target)
+            expanded += stats['expanded']
+        elapsed = time.perf_counter() - start_time
+        print(f'{name:>14} {expanded // queries:>10} {1000 * elapsed / queries:>10.2f}')
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['benchmark']:
+        benchmark()
+    elif sys.argv[1:] == ['benchmark-point-to-point']:
+        benchmark_point_to_point()
+    else:
+        # Example: find shortest paths starting from 'F'
+        shortest_path(my_graph, 'F')
@@ -1,91 +1,313 @@
+import random
+import sys
+import time
+
 
 class TreeNode:
+    # Fixed attribute slots instead of a per-node __dict__
+    __slots__ = ('key', 'left', 'right', 'height', 'size')
 
     def __init__(self, key):
         self.key = key
         self.left = None
         self.right = None
+        self.height = 1
+        self.size = 1
 
     def __str__(self):
         return str(self.key)
 
 class BinarySearchTree:
+    # All operations walk the tree with loops and an explicit path instead of
+    # recursion, so even a degenerate tree never hits the recursion limit.
 
     def __init__(self):
         self.root = None
 
-    def _insert(self, node, key):
-        if node is None:
-            return TreeNode(key)
+    def _replace_child(self, parent, old, new):
+        # Put new where old hangs below parent (or at the root)
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
 
-        if key < node.key:
-            node.left = self._insert(node.left, key)
-        elif key > node.key:
+    def _size(self, node):
+        return node.size if node else 0
 
-            node.right = self._insert(node.right, key)
-        return node
+    def _update_size(self, node):
+        node.size = 1 + self._size(node.left) + self._size(node.right)
+
+    def _retrace(self, path):
+        # Called with the root-to-parent path after every insert or delete
+        # that changed the tree: refresh the subtree sizes bottom-up.
+        # Subclasses extend it to restore their own invariants.
+        for node in reversed(path):
+            self._update_size(node)
 
     def insert(self, key):
-        self.root = self._insert(self.root, key)
-        
-    def _search(self, node, key):
-        if node is None or node.key == key:
-            return node
-        if key < node.key:
-            return self._search(node.left, key)
-        return self._search(node.right, key)
-    
+        if self.root is None:
+            self.root = TreeNode(key)
+            return
+
+        path = []
+        node = self.root
+        while True:
+            path.append(node)
+            if key < node.key:
+                if node.left is None:
+                    node.left = TreeNode(key)
+                    break
+                node = node.left
+            elif key > node.key:
+                if node.right is None:
+                    node.right = TreeNode(key)
+                    break
+                node = node.right
+            else:
+                return
+        self._retrace(path)
+
     def search(self, key):
-        return self._search(self.root, key)
+        node = self.root
+        while node is not None and node.key != key:
+            node = node.left if key < node.key else node.right
+        return node
 
-    def _delete(self, node, key):
+    def delete(self, key):
+        path = []
+        node = self.root
+        while node is not None and node.key != key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
         if node is None:
+            return
+
+        if node.left is not None and node.right is not None:
+            # Two children: take the key of the in-order successor and remove
+            # the successor node instead, which has no left child
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            node.key = successor.key
+            node = successor
+
+        child = node.left if node.left is not None else node.right
+        self._replace_child(path[-1] if path else None, node, child)
+        self._retrace(path)
+
+    def inorder_traversal(self):
+        # Lazily yield the keys in sorted order using an explicit stack
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+    def __len__(self):
+        return self._size(self.root)
+
+    def _count_below(self, key, inclusive):
+        # Number of keys < key (or <= key if inclusive), one root-to-leaf walk
+        count = 0
+        node = self.root
+        while node is not None:
+            if key < node.key or (key == node.key and not inclusive):
+                node = node.left
+            else:
+                count += 1 + self._size(node.left)
+                if key == node.key:
+                    break
+                node = node.right
+        return count
+
+    def rank(self, key):
+        # Number of keys smaller than key, in O(height)
+        return self._count_below(key, inclusive=False)
+
+    def select(self, index):
+        # The index-th smallest key (0-based), in O(height)
+        if not 0 <= index < len(self):
+            raise IndexError('tree index out of range')
+        node = self.root
+        while True:
+            left_size = self._size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node.key
+            else:
+                index -= left_size + 1
+                node = node.right
+
+    def count_range(self, lo, hi):
+        # Number of keys with lo <= key <= hi, in O(height)
+        if hi < lo:
+            return 0
+        return self._count_below(hi, inclusive=True) - self._count_below(lo, inclusive=False)
+
+    def range(self, lo, hi):
+        # Lazily yield the keys with lo <= key <= hi in sorted order, skipping
+        # every subtree that lies outside the range
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                if node.key < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if node.key > hi:
+                return
+            yield node.key
+            node = node.right
+
+    @classmethod
+    def from_sorted(cls, keys):
+        # Build a perfectly balanced tree from keys in ascending order in
+        # O(n); duplicate keys are dropped like insert() would
+        unique = []
+        for key in keys:
+            if unique and not unique[-1] < key:
+                if key == unique[-1]:
+                    continue
+                raise ValueError('keys must be in ascending order')
+            unique.append(key)
+
+        def build(start, end):
+            # Middle key as the root; the depth is only O(log n)
+            if start >= end:
+                return None
+            middle = (start + end) // 2
+            node = TreeNode(unique[middle])
+            node.left = build(start, middle)
+            node.right = build(middle + 1, end)
+            node.height = 1 + max(node.left.height if node.left else 0, node.right.height if node.right else 0)
+            node.size = end - start
             return node
-        if key < node.key:
-            node.left = self._delete(node.left, key)
-        elif key > node.key:
-            node.right = self._delete(node.right, key) 
-        else:
-            if node.left is None:
-                return node.right
-            elif node.right is None:
-                return node.left   
-            
-            node.key = self._min_value(node.right)
-            node.right = self._delete(node.right, node.key)   
-        
+
+        tree = cls()
+        tree.root = build(0, len(unique))
+        return tree
+
+    def height(self):
+        # Number of levels, counted level by level so deep trees are fine
+        height = 0
+        level = [self.root] if self.root else []
+        while level:
+            height += 1
+            level = [child for node in level for child in (node.left, node.right) if child]
+        return height
+
+
+class AVLTree(BinarySearchTree):
+    # Self-balancing mode: same API as BinarySearchTree, but after every
+    # insert or delete the nodes on the way back up are rebalanced with
+    # rotations, so the height stays O(log n) whatever the insertion order.
+
+    def _node_height(self, node):
+        return node.height if node else 0
+
+    def _update_height(self, node):
+        node.height = 1 + max(self._node_height(node.left), self._node_height(node.right))
+        self._update_size(node)
+
+    def _balance_factor(self, node):
+        return self._node_height(node.left) - self._node_height(node.right)
+
+    def _rotate_right(self, node):
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update_height(node)
+        self._update_height(pivot)
+        return pivot
+
+    def _rotate_left(self, node):
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update_height(node)
+        self._update_height(pivot)
+        return pivot
+
+    def _rebalance(self, node):
+        if node is None:
+            return node
+        self._update_height(node)
+        balance = self._balance_factor(node)
+        if balance > 1:
+            if self._balance_factor(node.left) < 0:
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._balance_factor(node.right) > 0:
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
         return node
 
-    def delete(self, key):
-        self.root = self._delete(self.root, key)
+    # Rebalance every node on the path bottom-up, hooking each rotated
+    # subtree back into its parent
+    def _retrace(self, path):
+        for index in range(len(path) - 1, -1, -1):
+            node = path[index]
+            subtree = self._rebalance(node)
+            if subtree is not node:
+                self._replace_child(path[index - 1] if index else None, node, subtree)
 
-    def _min_value(self, node):
-        while node.left is not None:
-            node = node.left
-        return node.key
 
-    def _inorder_traversal(self, node, result):
-        if node:
-            self._inorder_traversal(node.left, result)
-            result.append(node.key)
-            self._inorder_traversal(node.right, result)
+def benchmark(size=2000, seed=0):
+    # Compare the plain and the AVL tree on sorted, random and adversarial
+    # (zig-zag: smallest, largest, next smallest, ...) insertion orders
+    rng = random.Random(seed)
+    random_keys = list(range(size))
+    rng.shuffle(random_keys)
+    zigzag_keys = [key for pair in zip(range(size // 2), range(size - 1, size // 2 - 1, -1)) for key in pair]
+    orders = {'sorted': list(range(size)), 'random': random_keys, 'zigzag': zigzag_keys}
 
-    def inorder_traversal(self):
-        result = []
-        self._inorder_traversal(self.root, result)
-        return result
+    print(f'{size} keys')
+    print(f'{"tree":>18} {"order":>8} {"height":>7} {"insert s":>9} {"search s":>9}')
+    for tree_class in (BinarySearchTree, AVLTree):
+        for order, keys in orders.items():
+            tree = tree_class()
+            start_time = time.perf_counter()
+            for key in keys:
+                tree.insert(key)
+            insert_time = time.perf_counter() - start_time
+            start_time = time.perf_counter()
+            for key in keys:
+                tree.search(key)
+            search_time = time.perf_counter() - start_time
+            print(f'{tree_class.__name__:>18} {order:>8} {tree.height():>7} {insert_time:>9.4f} {search_time:>9.4f}')
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['benchmark']:
+        benchmark()
+        sys.exit()
 
-bst = BinarySearchTree()
-nodes = [50, 30, 20, 40, 70, 60, 80]
+    bst = BinarySearchTree()
+    nodes = [50, 30, 20, 40, 70, 60, 80]
 
-for node in nodes:
-    bst.insert(node)
+    for node in nodes:
+        bst.insert(node)
 
-print('Search for 80:', bst.search(80))
+    print('Search for 80:', bst.search(80))
 
-print("Inorder traversal:", bst.inorder_traversal())
+    print("Inorder traversal:", list(bst.inorder_traversal()))
 
-bst.delete(40)
+    bst.delete(40)
 
-print("Search for 40:", bst.search(40))
-print("Inorder traversal after deleting 40:", bst.inorder_traversal())
+    print("Search for 40:", bst.search(40))
+    print("Inorder traversal after deleting 40:", list(bst.inorder_traversal()))
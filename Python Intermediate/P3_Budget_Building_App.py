@@ -1,12 +1,56 @@
+import json
+import mmap
+import os
+import random
+import sys
+import time
+from collections.abc import Mapping
+
+
+class LedgerEntry(Mapping):
+    # One ledger line stored in two slots instead of a dict per entry.
+    # It still reads like the {"amount": ..., "description": ...} dict it
+    # replaces: entry['amount'], entry.get(...) and == with a dict all work.
+    __slots__ = ('amount', 'description')
+
+    def __init__(self, amount, description):
+        self.amount = amount
+        self.description = description
+
+    def __getitem__(self, key):
+        if key == 'amount':
+            return self.amount
+        if key == 'description':
+            return self.description
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(('amount', 'description'))
+
+    def __len__(self):
+        return 2
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
 class Category:
     def __init__(self, name):
-        # Each category has a name and a ledger (list of deposits/withdrawals)
+        # Each category has a name and a ledger (list of deposits/withdrawals).
+        # The balance and the total spent are kept up to date as entries are
+        # added, so the ledger should only be changed through the methods below.
         self.name = name
         self.ledger = []
+        self.balance = 0
+        self.spent = 0
 
     def get_balance(self):
-        # Current balance = sum of all amounts in the ledger
-        return sum(item['amount'] for item in self.ledger)
+        # Current balance, maintained by deposit() and withdraw()
+        return self.balance
+
+    def get_spent(self):
+        # Total of all withdrawals (including transfers out)
+        return self.spent
     
     def check_funds(self, amount):
         # Return True if enough balance is available, otherwise False
@@ -16,12 +60,15 @@ class Category:
 
     def deposit(self, amount, description=""):
         # Add a deposit to the ledger
-        self.ledger.append({"amount": amount, "description": description})
+        self.ledger.append(LedgerEntry(amount, description))
+        self.balance += amount
 
     def withdraw(self, amount, description=""):
         # Withdraw money if sufficient funds exist
         if self.check_funds(amount):
-            self.ledger.append({"amount": -amount, "description": description})
+            self.ledger.append(LedgerEntry(-amount, description))
+            self.balance += -amount
+            self.spent += amount
             return True
         return False
 
@@ -47,27 +94,177 @@ class Category:
         return title + items + total
     
 
-def create_spend_chart(categories):
-    """
-    Create a bar chart showing the percentage spent in each category.
-    - Only withdrawals count as 'spent'.
-    - Percentages are rounded down to the nearest 10.
-    - Chart is drawn with 'o' markers.
-    """
+class BudgetJournal:
+    # Append-only journal that makes Category ledgers survive a restart.
+    # Every successful deposit, withdrawal and transfer is appended to the
+    # current segment file as one JSON line. Writes are flushed and fsynced
+    # in batches of sync_every records, so a single write stays cheap.
+    # snapshot() saves each category's balance and spent total and starts a
+    # new segment; on start-up only the snapshot and the segments written
+    # after it are read, however long the history is. Older segments are
+    # never written again and are memory-mapped by history().
+    # Categories restored from a snapshot start with an empty in-memory
+    # ledger; their earlier entries are available through history().
 
-    # 1) Calculate total spent per category
-    spent = []
-    for cat in categories:
-        total_spent_cat = 0
-        for entry in cat.ledger:
-            amt = entry.get("amount", 0)
-            if amt < 0:  # withdrawals are negative
-                total_spent_cat += -amt
-        spent.append(total_spent_cat)
+    SNAPSHOT = "snapshot.json"
 
-    total_spent_all = sum(spent)
+    def __init__(self, directory, sync_every=64, segment_size=64 * 1024 * 1024):
+        self.directory = directory
+        self.sync_every = sync_every
+        self.segment_size = segment_size
+        self.categories = {}
+        self.unsynced = 0
+        os.makedirs(directory, exist_ok=True)
+
+        segment = self._load_snapshot()
+        segments = [number for number in self._segments() if number >= segment] or [segment]
+        for number in segments:
+            self._replay(number)
+        self.segment = segments[-1]
+        self.file = open(self._segment_path(self.segment), "ab")
+
+    def _segment_path(self, number):
+        return os.path.join(self.directory, f"journal-{number:06d}.log")
+
+    def _segments(self):
+        # Numbers of all segment files, oldest first
+        names = (name for name in os.listdir(self.directory)
+                 if name.startswith("journal-") and name.endswith(".log"))
+        return sorted(int(name[8:-4]) for name in names)
+
+    def _load_snapshot(self):
+        # Restore balances from the snapshot; returns the segment to replay from
+        path = os.path.join(self.directory, self.SNAPSHOT)
+        if not os.path.exists(path):
+            return 1
+        with open(path) as file:
+            snapshot = json.load(file)
+        for name, totals in snapshot["categories"].items():
+            category = self.category(name)
+            category.balance = totals["balance"]
+            category.spent = totals["spent"]
+        return snapshot["segment"]
+
+    def _replay(self, number):
+        # Apply the records of one segment. A torn last line from a crash
+        # is cut off so that new records are appended after the last good one.
+        path = self._segment_path(number)
+        if not os.path.exists(path):
+            return
+        good = 0
+        with open(path, "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                self._apply(record)
+                good += len(line)
+        if good != os.path.getsize(path):
+            os.truncate(path, good)
+
+    def _apply(self, record):
+        category = self.category(record["category"])
+        if record["op"] == "deposit":
+            category.deposit(record["amount"], record["description"])
+        elif record["op"] == "withdraw":
+            category.withdraw(record["amount"], record["description"])
+        else:
+            category.transfer(record["amount"], self.category(record["other"]))
+
+    def _append(self, record):
+        self.file.write(json.dumps(record).encode() + b"\n")
+        self.unsynced += 1
+        if self.unsynced >= self.sync_every:
+            self.sync()
+        if self.file.tell() >= self.segment_size:
+            self._rotate()
+
+    def _rotate(self):
+        # Close the current segment for good and start the next one
+        self.sync()
+        self.file.close()
+        self.segment += 1
+        self.file = open(self._segment_path(self.segment), "ab")
+
+    def category(self, name):
+        # The category with this name, created on first use
+        if name not in self.categories:
+            self.categories[name] = Category(name)
+        return self.categories[name]
+
+    def deposit(self, name, amount, description=""):
+        self.category(name).deposit(amount, description)
+        self._append({"op": "deposit", "category": name, "amount": amount, "description": description})
+
+    def withdraw(self, name, amount, description=""):
+        if not self.category(name).withdraw(amount, description):
+            return False
+        self._append({"op": "withdraw", "category": name, "amount": amount, "description": description})
+        return True
+
+    def transfer(self, name, amount, other_name):
+        if not self.category(name).transfer(amount, self.category(other_name)):
+            return False
+        self._append({"op": "transfer", "category": name, "amount": amount, "other": other_name})
+        return True
+
+    def sync(self):
+        # Push buffered records to disk
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+
+    def snapshot(self):
+        # Save every category's totals and start a new segment, so the next
+        # start-up replays nothing written before this point
+        self._rotate()
+        snapshot = {
+            "segment": self.segment,
+            "categories": {name: {"balance": category.balance, "spent": category.spent}
+                           for name, category in self.categories.items()},
+        }
+        path = os.path.join(self.directory, self.SNAPSHOT)
+        with open(path + ".tmp", "w") as file:
+            json.dump(snapshot, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(path + ".tmp", path)
+
+    def history(self, name=None):
+        # Yield every journal record, oldest first, optionally only those
+        # touching one category. Segments are memory-mapped read-only.
+        self.file.flush()
+        for number in self._segments():
+            with open(self._segment_path(number), "rb") as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    continue
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    start = 0
+                    while (end := mapped.find(b"\n", start)) != -1:
+                        record = json.loads(mapped[start:end])
+                        start = end + 1
+                        if name is None or name in (record["category"], record.get("other")):
+                            yield record
+
+    def close(self):
+        self.sync()
+        self.file.close()
 
-    # 2) Calculate spend percentages (rounded down to nearest 10)
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def spend_percentages(categories):
+    # Share of the total spent per category, rounded down to the nearest 10.
+    # Uses the spent totals each Category maintains, not the ledgers.
+    spent = [cat.get_spent() for cat in categories]
+    total_spent_all = sum(spent)
     percents = []
     for s in spent:
         if total_spent_all == 0:
@@ -76,62 +273,117 @@ def create_spend_chart(categories):
             raw = int((s / total_spent_all) * 100)
             p = raw - (raw % 10)    # round down
         percents.append(p)
+    return percents
 
-    # 3) Build chart lines
-    lines = []
-    lines.append("Percentage spent by category")
 
-    # Y-axis labels from 100 down to 0
+def render_spend_chart(names, percents):
+    # Draw the chart for the given category names and percentages
+    lines = ["Percentage spent by category"]
+
+    # Y-axis labels from 100 down to 0, one 'o' column per category
     for level in range(100, -1, -10):
-        row = str(level).rjust(3) + "|"  # align numbers
-        for p in percents:
-            if p >= level:
-                row += " o "
-            else:
-                row += "   "
-        row += " "  # trailing space after last column
-        lines.append(row)
+        bars = "".join(" o " if p >= level else "   " for p in percents)
+        lines.append(f"{level:>3}|{bars} ")
 
     # Horizontal line under bars
-    dash_len = 3 * len(categories) + 1
-    lines.append("    " + "-" * dash_len)
+    lines.append("    " + "-" * (3 * len(names) + 1))
 
     # Category names printed vertically
-    max_len = max(len(cat.name) for cat in categories)
+    max_len = max(len(name) for name in names)
     for i in range(max_len):
-        row = "     "  # spacing before names
-        for cat in categories:
-            if i < len(cat.name):
-                row += cat.name[i] + "  "
-            else:
-                row += "   "
-        lines.append(row)
+        letters = "".join(name[i] + "  " if i < len(name) else "   " for name in names)
+        lines.append("     " + letters)
 
     # Return full chart as string (no extra newline at end)
     return "\n".join(lines)
 
 
+def create_spend_chart(categories):
+    """
+    Create a bar chart showing the percentage spent in each category.
+    - Only withdrawals count as 'spent'.
+    - Percentages are rounded down to the nearest 10.
+    - Chart is drawn with 'o' markers.
+    """
+    return render_spend_chart([cat.name for cat in categories], spend_percentages(categories))
+
+
+class SpendChart:
+    # Spend chart for a dashboard that is redrawn often.
+    # The rendered chart is cached and only drawn again when the rounded
+    # percentages (or the categories) change, which most withdrawals don't.
+    # With per_page set, many categories are split over several charts of
+    # per_page columns each; percentages stay relative to the overall total.
+
+    def __init__(self, categories, per_page=None):
+        self.categories = categories
+        self.per_page = per_page
+        self.cache_key = None
+        self.cached_pages = []
+
+    def pages(self):
+        # One chart string per page of categories
+        names = [cat.name for cat in self.categories]
+        percents = spend_percentages(self.categories)
+        key = (tuple(names), tuple(percents), self.per_page)
+        if key != self.cache_key:
+            size = self.per_page or max(1, len(names))
+            self.cached_pages = [render_spend_chart(names[i:i + size], percents[i:i + size])
+                                 for i in range(0, len(names), size)]
+            self.cache_key = key
+        return self.cached_pages
+
+    def render(self):
+        # All pages, separated by a blank line
+        return "\n\n".join(self.pages())
+
+
+def benchmark(transactions=1_000_000, categories=10, seed=0):
+    # Replay random deposits, withdrawals and transfers
+    rng = random.Random(seed)
+    budget = [Category(f"Category {i}") for i in range(categories)]
+    start_time = time.perf_counter()
+    for _ in range(transactions):
+        category = rng.choice(budget)
+        kind = rng.random()
+        amount = rng.randint(1, 10000) / 100
+        if kind < 0.4:
+            category.deposit(amount, "deposit")
+        elif kind < 0.9:
+            category.withdraw(amount, "withdrawal")
+        else:
+            category.transfer(amount, rng.choice(budget))
+    elapsed = time.perf_counter() - start_time
+    entries = sum(len(category.ledger) for category in budget)
+    print(f"{transactions} transactions ({entries} ledger entries) in {elapsed:.2f}s, "
+          f"{transactions / elapsed:,.0f} per second")
+
+
 # ---------------- Example Usage ----------------
-food = Category("Food")
-entertainment = Category("Entertainment")
-business = Category("Business")
+if __name__ == "__main__":
+    if sys.argv[1:] == ["benchmark"]:
+        benchmark()
+        sys.exit()
+
+    food = Category("Food")
+    entertainment = Category("Entertainment")
+    business = Category("Business")
 
-# Add deposits and withdrawals
-food.deposit(1000, "initial deposit")
-food.withdraw(150.25, "groceries")
-food.withdraw(50.75, "restaurant and more food")
+    # Add deposits and withdrawals
+    food.deposit(1000, "initial deposit")
+    food.withdraw(150.25, "groceries")
+    food.withdraw(50.75, "restaurant and more food")
 
-entertainment.deposit(1000, "initial deposit")
-entertainment.withdraw(200, "movies and games")
+    entertainment.deposit(1000, "initial deposit")
+    entertainment.withdraw(200, "movies and games")
 
-business.deposit(1000, "initial deposit")
-business.withdraw(10, "paper")
+    business.deposit(1000, "initial deposit")
+    business.withdraw(10, "paper")
 
-# Show ledgers
-print(food)
-print(entertainment)
-print(business)
+    # Show ledgers
+    print(food)
+    print(entertainment)
+    print(business)
 
-# Show the spend chart
-print(create_spend_chart([food, entertainment, business]))
-# ---------------- Example Usage ----------------
\ No newline at end of file
+    # Show the spend chart
+    print(create_spend_chart([food, entertainment, business]))
@@ -1,3 +1,28 @@
+import argparse   # command line of the batch solver
+import os         # CPU count for the process pool
+import sys        # command-line switches
+import time       # timing for the benchmark and the batch solver
+from collections import deque   # queue of in-flight batch chunks
+from concurrent.futures import ProcessPoolExecutor   # parallel batch solving
+from contextlib import nullcontext   # optional timings file
+
+# Lookup tables for the bitmask engine. Cells are numbered 0..80 row by row;
+# a digit d is represented by the bit 1 << (d - 1).
+ALL_DIGITS = 0x1FF
+CELL_ROW = [cell // 9 for cell in range(81)]
+CELL_COL = [cell % 9 for cell in range(81)]
+CELL_BOX = [(cell // 27) * 3 + (cell % 9) // 3 for cell in range(81)]
+# The 27 units (9 rows, 9 columns, 9 boxes) as lists of cell numbers
+UNITS = (
+    [[row * 9 + col for col in range(9)] for row in range(9)]
+    + [[row * 9 + col for row in range(9)] for col in range(9)]
+    + [[box_row * 27 + box_col * 3 + row * 9 + col for row in range(3) for col in range(3)]
+       for box_row in range(3) for box_col in range(3)]
+)
+# Digit for each single-bit mask
+BIT_DIGIT = {1 << (digit - 1): digit for digit in range(1, 10)}
+
+
 # Define a class to represent the Sudoku board and all operations on it
 class Board:
     def __init__(self, board):
@@ -77,30 +102,476 @@ class Board:
         # if no number fits, return False → triggers backtracking
         return False
 
+    def bitmask_solver(self):
+        # constraint-propagation solver: the digits used in every row, column
+        # and box are kept as bitmasks, so the candidates of a cell are a few
+        # bit operations instead of scanning the board
+        grid = [num for row in self.board for num in row]
+        state = ([0] * 9, [0] * 9, [0] * 9)   # row, column and box masks
+        for cell, num in enumerate(grid):
+            if num:
+                bit = 1 << (num - 1)
+                if bit & self._used(state, cell):
+                    return False   # the givens already clash
+                self._place(state, cell, bit)
+
+        if not self._search(grid, state):
+            return False
+        # copy the solution back into the 2D board
+        for row in range(9):
+            self.board[row][:] = grid[row * 9:row * 9 + 9]
+        return True
+
+    @staticmethod
+    def _used(state, cell):
+        # digits already taken in the row, column and box of the cell
+        rows, cols, boxes = state
+        return rows[CELL_ROW[cell]] | cols[CELL_COL[cell]] | boxes[CELL_BOX[cell]]
+
+    @staticmethod
+    def _place(state, cell, bit):
+        # mark a digit as used (or unused again: XOR toggles the bit)
+        rows, cols, boxes = state
+        rows[CELL_ROW[cell]] ^= bit
+        cols[CELL_COL[cell]] ^= bit
+        boxes[CELL_BOX[cell]] ^= bit
+
+    def _propagate(self, grid, state, trail):
+        # fill naked singles (cells with one candidate) and hidden singles
+        # (digits with one possible cell in a unit) until nothing changes;
+        # every placed cell is pushed on trail so it can be undone.
+        # Returns False on a contradiction.
+        progress = True
+        while progress:
+            progress = False
+            for cell in range(81):
+                if grid[cell]:
+                    continue
+                candidates = ALL_DIGITS & ~self._used(state, cell)
+                if not candidates:
+                    return False
+                if candidates & (candidates - 1) == 0:
+                    grid[cell] = BIT_DIGIT[candidates]
+                    self._place(state, cell, candidates)
+                    trail.append(cell)
+                    progress = True
+
+            for unit in UNITS:
+                # count in which cells of the unit each digit could still go
+                seen_once = seen_twice = placed = 0
+                for cell in unit:
+                    if grid[cell]:
+                        placed |= 1 << (grid[cell] - 1)
+                        continue
+                    candidates = ALL_DIGITS & ~self._used(state, cell)
+                    seen_twice |= seen_once & candidates
+                    seen_once |= candidates
+                if (seen_once | placed) != ALL_DIGITS:
+                    return False   # some digit has nowhere to go
+                hidden = seen_once & ~seen_twice & ~placed
+                if not hidden:
+                    continue
+                for cell in unit:
+                    if grid[cell]:
+                        continue
+                    bit = hidden & ~self._used(state, cell)
+                    if bit:
+                        if bit & (bit - 1):
+                            return False   # two digits need the same cell
+                        grid[cell] = BIT_DIGIT[bit]
+                        self._place(state, cell, bit)
+                        trail.append(cell)
+                        progress = True
+        return True
+
+    def _undo(self, grid, state, trail):
+        for cell in trail:
+            self._place(state, cell, 1 << (grid[cell] - 1))
+            grid[cell] = 0
+
+    def _search(self, grid, state):
+        # propagate, then branch on the most constrained empty cell (MRV)
+        trail = []
+        if not self._propagate(grid, state, trail):
+            self._undo(grid, state, trail)
+            return False
+
+        best_cell, best_candidates, best_count = None, 0, 10
+        for cell in range(81):
+            if grid[cell]:
+                continue
+            candidates = ALL_DIGITS & ~self._used(state, cell)
+            count = candidates.bit_count()
+            if count < best_count:
+                best_cell, best_candidates, best_count = cell, candidates, count
+                if count == 2:
+                    break
+        if best_cell is None:
+            return True   # no empty cells → solved!
+
+        while best_candidates:
+            bit = best_candidates & -best_candidates   # lowest candidate
+            best_candidates ^= bit
+            grid[best_cell] = BIT_DIGIT[bit]
+            self._place(state, best_cell, bit)
+            if self._search(grid, state):
+                return True
+            self._place(state, best_cell, bit)
+            grid[best_cell] = 0
+
+        self._undo(grid, state, trail)
+        return False
+
+
+# Knuth's Dancing Links (Algorithm X) for exact cover problems.
+# Every 1 in the 0/1 matrix is a node in circular doubly linked lists, both
+# along its row and down its column, kept in flat lists indexed by node
+# number: node 0 is the root and nodes 1..n_columns are the column headers.
+# Covering a column unlinks it and every row that uses it; uncovering puts
+# the links back in reverse order, so backtracking costs no copying.
+class DancingLinks:
+    def __init__(self, n_columns, rows):
+        # rows is a list of lists of column numbers (0-based)
+        headers = n_columns + 1
+        self.left = [i - 1 for i in range(headers)]
+        self.right = [i + 1 for i in range(headers)]
+        self.left[0], self.right[-1] = n_columns, 0
+        self.up = list(range(headers))
+        self.down = list(range(headers))
+        self.column = list(range(headers))
+        self.size = [0] * headers
+        self.row_of = [None] * headers
+        self.nodes = 0        # search tree nodes visited (rows tried)
+        self.backtracks = 0   # columns that ran out of rows
+
+        for row_number, columns in enumerate(rows):
+            first = None
+            for col in columns:
+                header = col + 1
+                node = len(self.column)
+                # append the node at the bottom of its column
+                self.up.append(self.up[header])
+                self.down.append(header)
+                self.down[self.up[header]] = node
+                self.up[header] = node
+                self.column.append(header)
+                self.size[header] += 1
+                self.row_of.append(row_number)
+                # and at the end of its row
+                if first is None:
+                    first = node
+                    self.left.append(node)
+                    self.right.append(node)
+                else:
+                    self.left.append(self.left[first])
+                    self.right.append(first)
+                    self.right[self.left[first]] = node
+                    self.left[first] = node
+
+    def _cover(self, header):
+        left, right, up, down = self.left, self.right, self.up, self.down
+        right[left[header]] = right[header]
+        left[right[header]] = left[header]
+        i = down[header]
+        while i != header:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                self.size[self.column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, header):
+        left, right, up, down = self.left, self.right, self.up, self.down
+        i = up[header]
+        while i != header:
+            j = left[i]
+            while j != i:
+                self.size[self.column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[header]] = header
+        left[right[header]] = header
+
+    def _select(self, node):
+        # cover the other columns of the chosen row
+        j = self.right[node]
+        while j != node:
+            self._cover(self.column[j])
+            j = self.right[j]
+
+    def _unselect(self, node):
+        j = self.left[node]
+        while j != node:
+            self._uncover(self.column[j])
+            j = self.left[j]
+
+    def search(self, limit=None):
+        # Yield each exact cover as a list of row numbers, stopping after
+        # limit solutions. The search keeps its own stack of chosen rows, so
+        # deep searches never hit the recursion limit, and always picks the
+        # column with the fewest remaining rows.
+        right, down, size = self.right, self.down, self.size
+        chosen = []
+        found = 0
+        try:
+            while True:
+                if right[0] == 0:
+                    found += 1
+                    yield [self.row_of[node] for node in chosen]
+                    if limit is not None and found >= limit or not chosen:
+                        return
+                    # look for the next solution: continue below the last row
+                    node = chosen.pop()
+                    self._unselect(node)
+                    header = self.column[node]
+                    node = down[node]
+                else:
+                    header = right[0]
+                    col = right[header]
+                    while col != 0:
+                        if size[col] < size[header]:
+                            header = col
+                        col = right[col]
+                    self._cover(header)
+                    node = down[header]
+
+                # try the next row of the column, backtracking while the
+                # current column has no rows left
+                while node == header:
+                    self._uncover(header)
+                    self.backtracks += 1
+                    if not chosen:
+                        return
+                    node = chosen.pop()
+                    self._unselect(node)
+                    header = self.column[node]
+                    node = down[node]
+                self.nodes += 1
+                self._select(node)
+                chosen.append(node)
+        finally:
+            # restore the matrix if the search stopped early
+            while chosen:
+                node = chosen.pop()
+                self._unselect(node)
+                self._uncover(self.column[node])
+
+
+# Build the exact cover matrix of an N x N Sudoku (N = 4, 9, 16, 25, ...).
+# Columns: every cell filled once, every digit once per row, column and box.
+# Rows: one per (row, col, digit) choice; a given cell only gets its digit.
+# Returns the DancingLinks matrix and the (row, col, digit) of each row.
+def sudoku_exact_cover(board):
+    size = len(board)
+    box = int(round(size ** 0.5))
+    if box * box != size or any(len(row) != size for row in board):
+        raise ValueError('The board must be N x N with N a perfect square')
+
+    cells = size * size
+    choices = []
+    rows = []
+    for row in range(size):
+        for col in range(size):
+            given = board[row][col]
+            box_no = (row // box) * box + col // box
+            for digit in ([given] if given else range(1, size + 1)):
+                choices.append((row, col, digit))
+                rows.append([
+                    row * size + col,
+                    cells + row * size + digit - 1,
+                    2 * cells + col * size + digit - 1,
+                    3 * cells + box_no * size + digit - 1,
+                ])
+    return DancingLinks(4 * cells, rows), choices
 
-# Helper function to use the Board class and solve the puzzle
-def solve_sudoku(board):
+
+# Solve an N x N Sudoku with Dancing Links.
+# Returns (solutions, stats): up to limit solved boards (all if limit is
+# None) and the search statistics ('nodes' visited and 'backtracks').
+def solve_dlx(board, limit=1):
+    matrix, choices = sudoku_exact_cover(board)
+    solutions = []
+    for rows in matrix.search(limit):
+        solved = [row[:] for row in board]
+        for row_number in rows:
+            row, col, digit = choices[row_number]
+            solved[row][col] = digit
+        solutions.append(solved)
+    return solutions, {'nodes': matrix.nodes, 'backtracks': matrix.backtracks}
+
+
+# Count the solutions of an N x N Sudoku, stopping at limit (e.g. limit=2 to
+# check that a puzzle has a unique solution). Returns (count, stats).
+def count_solutions(board, limit=None):
+    matrix, _ = sudoku_exact_cover(board)
+    count = sum(1 for _ in matrix.search(limit))
+    return count, {'nodes': matrix.nodes, 'backtracks': matrix.backtracks}
+
+
+# Turn a puzzle string (81 characters for 9x9, 256 for 16x16, ...) into a
+# 2D list. '0' or '.' is an empty cell; digits above 9 are written A, B, ...
+def parse_puzzle(text):
+    digits = [0 if char in '.0' else int(char, 36) for char in text.strip()]
+    size = int(round(len(digits) ** 0.5))
+    box = int(round(size ** 0.5))
+    if size * size != len(digits) or box * box != size:
+        raise ValueError('A puzzle needs N x N cells with N a perfect square')
+    if any(digit > size for digit in digits):
+        raise ValueError(f'The digits of a {size} x {size} puzzle go from 1 to {size}')
+    return [digits[row * size:row * size + size] for row in range(size)]
+
+
+# Helper function to use the Board class and solve the puzzle.
+# engine='bitmask' uses constraint propagation, 'backtracking' the plain solver
+def solve_sudoku(board, engine='bitmask'):
     gameboard = Board(board)   # create a Board instance
     print(f'Puzzle to solve:\n{gameboard}')  # show unsolved puzzle
-    if gameboard.solver():     # attempt to solve it
+    solver = gameboard.bitmask_solver if engine == 'bitmask' else gameboard.solver
+    if solver():     # attempt to solve it
         print(f'Solved puzzle:\n{gameboard}')  # show solved puzzle
     else:
         print('The provided puzzle is unsolvable.')  # no solution exists
     return gameboard
 
 
-# Example Sudoku puzzle with 0 representing empty cells
-puzzle = [
-  [0, 0, 2, 0, 0, 8, 0, 0, 0],
-  [0, 0, 0, 0, 0, 3, 7, 6, 2],
-  [4, 3, 0, 0, 0, 0, 8, 0, 0],
-  [0, 5, 0, 0, 3, 0, 0, 9, 0],
-  [0, 4, 0, 0, 0, 0, 0, 2, 6],
-  [0, 0, 0, 4, 6, 7, 0, 0, 0],
-  [0, 8, 6, 7, 0, 4, 0, 0, 0],
-  [0, 0, 0, 5, 1, 9, 0, 0, 8],
-  [1, 7, 0, 0, 0, 6, 0, 0, 5]
-]
-
-# Run the solver on the puzzle
-solve_sudoku(puzzle)
+# Solve one 9x9 puzzle line without printing.
+# Returns (solution line, seconds); the solution is 'unsolvable' or
+# 'invalid' if the puzzle has no solution or is not 81 cells of 0-9 or '.'.
+def solve_puzzle_line(line):
+    start_time = time.perf_counter()
+    try:
+        board = parse_puzzle(line)
+    except ValueError:
+        board = None
+    if board is None or len(board) != 9:
+        return 'invalid', time.perf_counter() - start_time
+    gameboard = Board(board)
+    if gameboard.bitmask_solver():
+        solution = ''.join(str(num) for row in gameboard.board for num in row)
+    else:
+        solution = 'unsolvable'
+    return solution, time.perf_counter() - start_time
+
+
+# Worker task: solve a chunk of puzzle lines
+def _solve_chunk(lines):
+    return [solve_puzzle_line(line) for line in lines]
+
+
+# Read the non-blank lines of a file in chunks of chunk_size lines
+def _read_chunks(input_path, chunk_size):
+    chunk = []
+    with open(input_path) as input_file:
+        for line in input_file:
+            line = line.strip()
+            if not line:
+                continue
+            chunk.append(line)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+# Solve every puzzle of input_path (one 81-character puzzle per line) on a
+# process pool and write the solutions to output_path in input order.
+# Puzzles are streamed in chunks of chunk_size with at most two chunks per
+# worker in flight, so the file never has to fit in memory. If timings_path
+# is given, the solve time of every puzzle is written there as CSV.
+# Returns a summary with counts, wall time and puzzles per second.
+def solve_batch(input_path, output_path, workers=None, chunk_size=1000, timings_path=None):
+    workers = workers or os.cpu_count() or 1
+    summary = {'puzzles': 0, 'solved': 0, 'unsolvable': 0, 'invalid': 0}
+    start_time = time.perf_counter()
+
+    with ProcessPoolExecutor(workers) as executor, open(output_path, 'w') as output_file, \
+            (open(timings_path, 'w') if timings_path else nullcontext()) as timings_file:
+        if timings_file:
+            timings_file.write('puzzle,seconds\n')
+
+        def write(results):
+            for solution, seconds in results:
+                output_file.write(solution + '\n')
+                if timings_file:
+                    timings_file.write(f'{summary["puzzles"]},{seconds:.6f}\n')
+                summary['puzzles'] += 1
+                summary['solved' if solution not in ('unsolvable', 'invalid') else solution] += 1
+
+        in_flight = deque()
+        for chunk in _read_chunks(input_path, chunk_size):
+            in_flight.append(executor.submit(_solve_chunk, chunk))
+            if len(in_flight) >= 2 * workers:
+                write(in_flight.popleft().result())
+        while in_flight:
+            write(in_flight.popleft().result())
+
+    summary['seconds'] = time.perf_counter() - start_time
+    summary['puzzles_per_second'] = summary['puzzles'] / summary['seconds'] if summary['seconds'] else 0.0
+    return summary
+
+
+# Command line: python Sudoko_Solver.py batch puzzles.txt solutions.txt
+def batch_main(argv):
+    parser = argparse.ArgumentParser(prog='Sudoko_Solver.py batch',
+                                     description='Solve a file of 81-character puzzles in parallel.')
+    parser.add_argument('input', help='file with one puzzle per line')
+    parser.add_argument('output', help='file to write the solutions to, in input order')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='puzzles per task')
+    parser.add_argument('--timings', default=None, help='CSV file for per-puzzle solve times')
+    args = parser.parse_args(argv)
+
+    summary = solve_batch(args.input, args.output, args.workers, args.chunk_size, args.timings)
+    print(f'{summary["puzzles"]} puzzles in {summary["seconds"]:.2f}s '
+          f'({summary["puzzles_per_second"]:.1f} puzzles/sec): {summary["solved"]} solved, '
+          f'{summary["unsolvable"]} unsolvable, {summary["invalid"]} invalid')
+
+
+# Well-known hard puzzles used by the benchmark
+HARD_PUZZLES = {
+    'Arto Inkala 2012': '800000000003600000070090200050007000000045700000100030001000068008500010090000400',
+    'AI Escargot': '100007090030020008009600500005300900010080002600004000300000010040000007007000300',
+}
+
+
+# Time both engines on the hard puzzles
+def benchmark():
+    print(f'{"puzzle":>18} {"engine":>13} {"ms":>10}')
+    for name, text in HARD_PUZZLES.items():
+        for engine in ('bitmask', 'backtracking'):
+            gameboard = Board(parse_puzzle(text))
+            solver = gameboard.bitmask_solver if engine == 'bitmask' else gameboard.solver
+            start_time = time.perf_counter()
+            solver()
+            elapsed = time.perf_counter() - start_time
+            print(f'{name:>18} {engine:>13} {1000 * elapsed:>10.1f}')
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['benchmark']:
+        benchmark()
+        sys.exit()
+    if sys.argv[1:2] == ['batch']:
+        batch_main(sys.argv[2:])
+        sys.exit()
+
+    # Example Sudoku puzzle with 0 representing empty cells
+    puzzle = [
+      [0, 0, 2, 0, 0, 8, 0, 0, 0],
+      [0, 0, 0, 0, 0, 3, 7, 6, 2],
+      [4, 3, 0, 0, 0, 0, 8, 0, 0],
+      [0, 5, 0, 0, 3, 0, 0, 9, 0],
+      [0, 4, 0, 0, 0, 0, 0, 2, 6],
+      [0, 0, 0, 4, 6, 7, 0, 0, 0],
+      [0, 8, 6, 7, 0, 4, 0, 0, 0],
+      [0, 0, 0, 5, 1, 9, 0, 0, 8],
+      [1, 7, 0, 0, 0, 6, 0, 0, 5]
+    ]
+
+    # Run the solver on the puzzle
+    solve_sudoku(puzzle)
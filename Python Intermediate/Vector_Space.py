@@ -1,39 +1,88 @@
+import random
+import sys
+import time
+from array import array
+from itertools import repeat
+from math import hypot, sqrt
+from operator import add, ge, gt, le, lt, mul, sub
+
+
+# Create an instance without running __init__; the operators below fill in
+# the component slots directly, which is much cheaper than keyword arguments
+_new_vector = object.__new__
+
+
+# Rebuild a pickled or copied vector through its constructor
+def _restore_vector(cls, components):
+    return cls(**components)
+
+
 # ==============================================
 # 2D Vector Class with Basic Operations
+# Components live in __slots__ (no per-instance __dict__) and every
+# operation is written out per component. Vectors are immutable: the
+# components are read-only, operations always return new vectors, and the
+# norm is cached the first time it is computed.
 # ==============================================
 class R2Vector:
+    __slots__ = ('x', 'y', '_norm')
+    # Component names in order, used for printing
+    components = ('x', 'y')
+
     # Initialize 2D vector with x and y components
     def __init__(self, *, x, y):
-        self.x = x
-        self.y = y
+        _set_x(self, x)
+        _set_y(self, y)
+
+    # Squared norm: enough for comparing magnitudes, no square root needed
+    def squared_norm(self):
+        return self.x * self.x + self.y * self.y
 
-    # Compute the Euclidean norm (magnitude) of the vector
+    # Compute the Euclidean norm (magnitude) of the vector, cached after the first call
     def norm(self):
-        return sum(val**2 for val in vars(self).values())**0.5
+        try:
+            return self._norm
+        except AttributeError:
+            _set_norm(self, self.squared_norm() ** 0.5)
+            return self._norm
+
+    # Components are read-only, so the cached norm can never go stale
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __reduce__(self):
+        return _restore_vector, (type(self), {key: getattr(self, key) for key in self.components})
 
     # Return a human-readable string representation, e.g. (2, 3)
     def __str__(self):
-        return str(tuple(getattr(self, i) for i in vars(self)))
+        return str(tuple(getattr(self, i) for i in self.components))
 
     # Return a more detailed string representation for debugging, e.g. R2Vector(x=2, y=3)
     def __repr__(self):
-        arg_list = [f'{key}={val}' for key, val in vars(self).items()]
+        arg_list = [f'{key}={getattr(self, key)}' for key in self.components]
         args = ', '.join(arg_list)
         return f'{self.__class__.__name__}({args})'
 
     # Vector addition: component-wise sum
     def __add__(self, other):
-        if type(self) != type(other):
+        if type(self) is not type(other):
             return NotImplemented
-        kwargs = {i: getattr(self, i) + getattr(other, i) for i in vars(self)}
-        return self.__class__(**kwargs)
+        result = _new_vector(type(self))
+        _set_x(result, self.x + other.x)
+        _set_y(result, self.y + other.y)
+        return result
 
     # Vector subtraction: component-wise difference
     def __sub__(self, other):
-        if type(self) != type(other):
+        if type(self) is not type(other):
             return NotImplemented
-        kwargs = {i: getattr(self, i) - getattr(other, i) for i in vars(self)}
-        return self.__class__(**kwargs)
+        result = _new_vector(type(self))
+        _set_x(result, self.x - other.x)
+        _set_y(result, self.y - other.y)
+        return result
 
     # Overload the * operator
     # - Scalar multiplication when 'other' is a number
@@ -41,35 +90,36 @@ class R2Vector:
     def __mul__(self, other):
         if type(other) in (int, float):
             # Scale each component by the scalar value
-            kwargs = {i: getattr(self, i) * other for i in vars(self)}
-            return self.__class__(**kwargs)        
-        elif type(self) == type(other):
+            result = _new_vector(type(self))
+            _set_x(result, self.x * other)
+            _set_y(result, self.y * other)
+            return result
+        elif type(self) is type(other):
             # Compute the dot product
-            args = [getattr(self, i) * getattr(other, i) for i in vars(self)]
-            return sum(args)
+            return self.x * other.x + self.y * other.y
         return NotImplemented
 
     # Equality operator (==): True if all components are equal
     def __eq__(self, other):
-        if type(self) != type(other):
+        if type(self) is not type(other):
             return NotImplemented
-        return all(getattr(self, i) == getattr(other, i) for i in vars(self))
+        return self.x == other.x and self.y == other.y
         
     # Inequality operator (!=): opposite of equality
     def __ne__(self, other):
         return not self == other
 
-    # Less-than operator (<): compares vector magnitudes
+    # Less-than operator (<): compares vector magnitudes (squared, same order)
     def __lt__(self, other):
-        if type(self) != type(other):
+        if type(self) is not type(other):
             return NotImplemented
-        return self.norm() < other.norm()
+        return self.squared_norm() < other.squared_norm()
 
-    # Greater-than operator (>): compares vector magnitudes
+    # Greater-than operator (>): compares vector magnitudes (squared, same order)
     def __gt__(self, other):
-        if type(self) != type(other):
+        if type(self) is not type(other):
             return NotImplemented
-        return self.norm() > other.norm()
+        return self.squared_norm() > other.squared_norm()
 
     # Less-than-or-equal-to (<=): opposite of greater-than
     def __le__(self, other):
@@ -82,51 +132,296 @@ class R2Vector:
 
 # ==============================================
 # 3D Vector Class — Inherits from R2Vector
-# Adds z component and cross product operation
+# Adds z component and cross product operation; the arithmetic is
+# written out again for three components
 # ==============================================
 class R3Vector(R2Vector):
+    __slots__ = ('z',)
+    components = ('x', 'y', 'z')
+
     # Initialize 3D vector with x, y, z components
     def __init__(self, *, x, y, z):
-        super().__init__(x=x, y=y)
-        self.z = z
+        _set_x(self, x)
+        _set_y(self, y)
+        _set_z(self, z)
+
+    def squared_norm(self):
+        return self.x * self.x + self.y * self.y + self.z * self.z
+
+    def __add__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        result = _new_vector(type(self))
+        _set_x(result, self.x + other.x)
+        _set_y(result, self.y + other.y)
+        _set_z(result, self.z + other.z)
+        return result
+
+    def __sub__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        result = _new_vector(type(self))
+        _set_x(result, self.x - other.x)
+        _set_y(result, self.y - other.y)
+        _set_z(result, self.z - other.z)
+        return result
+
+    def __mul__(self, other):
+        if type(other) in (int, float):
+            result = _new_vector(type(self))
+            _set_x(result, self.x * other)
+            _set_y(result, self.y * other)
+            _set_z(result, self.z * other)
+            return result
+        elif type(self) is type(other):
+            return self.x * other.x + self.y * other.y + self.z * other.z
+        return NotImplemented
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y and self.z == other.z
         
     # Compute the cross product between two 3D vectors
     def cross(self, other):
-        if type(self) != type(other):
+        if type(self) is not type(other):
             return NotImplemented
 
         # Cross product formula:
         # (ay*bz - az*by, az*bx - ax*bz, ax*by - ay*bx)
-        kwargs = {
-            'x': self.y * other.z - self.z * other.y,
-            'y': self.z * other.x - self.x * other.z,
-            'z': self.x * other.y - self.y * other.x
-        }
+        result = _new_vector(type(self))
+        _set_x(result, self.y * other.z - self.z * other.y)
+        _set_y(result, self.z * other.x - self.x * other.z)
+        _set_z(result, self.x * other.y - self.y * other.x)
         
         # Return a new R3Vector instance representing the cross product
-        return self.__class__(**kwargs)
+        return result
+
+
+# Slot setters that bypass the read-only __setattr__, used to fill in the
+# components of vectors under construction
+_set_x = R2Vector.x.__set__
+_set_y = R2Vector.y.__set__
+_set_norm = R2Vector._norm.__set__
+_set_z = R3Vector.z.__set__
+
+
+# ==============================================
+# VectorArray — many vectors in contiguous columns
+# Stores N 2D or 3D vectors as one array('d') per component, so bulk
+# operations run over flat arrays instead of one object (and one dict)
+# per vector
+# ==============================================
+class VectorArray:
+    # Initialize from equal-length sequences of x, y (and optionally z) values
+    def __init__(self, *, x, y, z=None):
+        self.x = array('d', x)
+        self.y = array('d', y)
+        self.z = None if z is None else array('d', z)
+        if len(self.y) != len(self.x) or (self.z is not None and len(self.z) != len(self.x)):
+            raise ValueError('All components must have the same length')
+
+    # Component columns in order, e.g. (x, y, z)
+    def columns(self):
+        if self.z is None:
+            return (self.x, self.y)
+        return (self.x, self.y, self.z)
+
+    # Build from a list of R2Vector or R3Vector objects (all of one type)
+    @classmethod
+    def from_vectors(cls, vectors):
+        vectors = list(vectors)
+        if vectors and isinstance(vectors[0], R3Vector):
+            return cls(x=[v.x for v in vectors], y=[v.y for v in vectors], z=[v.z for v in vectors])
+        return cls(x=[v.x for v in vectors], y=[v.y for v in vectors])
+
+    # Convert back to a list of R2Vector or R3Vector objects
+    def to_vectors(self):
+        if self.z is None:
+            return [R2Vector(x=x, y=y) for x, y in zip(self.x, self.y)]
+        return [R3Vector(x=x, y=y, z=z) for x, y, z in zip(self.x, self.y, self.z)]
+
+    def __len__(self):
+        return len(self.x)
+
+    # Single vector at an index, e.g. R3Vector(x=1.0, y=2.0, z=3.0)
+    def __getitem__(self, index):
+        if self.z is None:
+            return R2Vector(x=self.x[index], y=self.y[index])
+        return R3Vector(x=self.x[index], y=self.y[index], z=self.z[index])
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(<{len(self)} vectors, {len(self.columns())}D>)'
+
+    # Same number of vectors and dimensions
+    def _matches(self, other):
+        return (isinstance(other, VectorArray) and len(other) == len(self)
+                and (other.z is None) == (self.z is None))
+
+    # Build a new VectorArray from already computed columns
+    def _from_columns(self, columns):
+        result = VectorArray.__new__(VectorArray)
+        result.x, result.y = columns[0], columns[1]
+        result.z = columns[2] if len(columns) == 3 else None
+        return result
+
+    # Vector addition: element-wise sum of each column
+    def __add__(self, other):
+        if not self._matches(other):
+            return NotImplemented
+        return self._from_columns([array('d', map(add, a, b)) for a, b in zip(self.columns(), other.columns())])
+
+    # Vector subtraction: element-wise difference of each column
+    def __sub__(self, other):
+        if not self._matches(other):
+            return NotImplemented
+        return self._from_columns([array('d', map(sub, a, b)) for a, b in zip(self.columns(), other.columns())])
+
+    # Overload the * operator like R2Vector does
+    # - Scalar multiplication when 'other' is a number
+    # - Dot products (one per vector) when 'other' is a VectorArray
+    def __mul__(self, other):
+        if type(other) in (int, float):
+            return self._from_columns([array('d', map(mul, column, repeat(other, len(self))))
+                                       for column in self.columns()])
+        if self._matches(other):
+            return self.dot(other)
+        return NotImplemented
+
+    # Scalar multiplication also works as scalar * vectors
+    def __rmul__(self, other):
+        if type(other) in (int, float):
+            return self * other
+        return NotImplemented
+
+    # Lazy dot products: the per-column products are chained map() calls, so
+    # all columns are walked in a single pass without temporary arrays
+    def _iter_dot(self, other):
+        columns = zip(self.columns(), other.columns())
+        a, b = next(columns)
+        result = map(mul, a, b)
+        for a, b in columns:
+            result = map(add, result, map(mul, a, b))
+        return result
+
+    # Dot product of each pair of vectors, as an array('d')
+    def dot(self, other):
+        if not self._matches(other):
+            raise ValueError('Dot product needs vector arrays of the same shape')
+        return array('d', self._iter_dot(other))
+
+    # Cross product of each pair of 3D vectors
+    def cross(self, other):
+        if not self._matches(other) or self.z is None:
+            raise ValueError('Cross product needs 3D vector arrays of the same length')
+        # (ay*bz - az*by, az*bx - ax*bz, ax*by - ay*bx)
+        ax, ay, az = self.columns()
+        bx, by, bz = other.columns()
+        return self._from_columns([
+            array('d', map(sub, map(mul, ay, bz), map(mul, az, by))),
+            array('d', map(sub, map(mul, az, bx), map(mul, ax, bz))),
+            array('d', map(sub, map(mul, ax, by), map(mul, ay, bx))),
+        ])
+
+    # Squared norm of each vector, the cheap way to compare magnitudes
+    def squared_norm(self):
+        return array('d', self._iter_dot(self))
+
+    # Euclidean norm (magnitude) of each vector, as an array('d')
+    def norm(self):
+        return array('d', map(sqrt, self._iter_dot(self)))
+
+    # Lazy magnitudes for the comparisons: math.hypot takes every component of
+    # a vector in one C call. It agrees with comparing squared norms except
+    # for magnitudes within rounding error of each other.
+    def _iter_hypot(self):
+        return map(hypot, *self.columns())
+
+    # Magnitude comparisons, one bool per pair of vectors; both magnitude
+    # streams are compared as they are computed.
+    def __lt__(self, other):
+        if not self._matches(other):
+            return NotImplemented
+        return list(map(lt, self._iter_hypot(), other._iter_hypot()))
+
+    def __gt__(self, other):
+        if not self._matches(other):
+            return NotImplemented
+        return list(map(gt, self._iter_hypot(), other._iter_hypot()))
+
+    def __le__(self, other):
+        if not self._matches(other):
+            return NotImplemented
+        return list(map(le, self._iter_hypot(), other._iter_hypot()))
+
+    def __ge__(self, other):
+        if not self._matches(other):
+            return NotImplemented
+        return list(map(ge, self._iter_hypot(), other._iter_hypot()))
+
+
+# ==============================================
+# Benchmark: list of R3Vector objects vs VectorArray
+# ==============================================
+def benchmark(size=1_000_000, seed=0):
+    rng = random.Random(seed)
+    first = [R3Vector(x=rng.random(), y=rng.random(), z=rng.random()) for _ in range(size)]
+    second = [R3Vector(x=rng.random(), y=rng.random(), z=rng.random()) for _ in range(size)]
+    first_array = VectorArray.from_vectors(first)
+    second_array = VectorArray.from_vectors(second)
+
+    operations = {
+        'add': (lambda: [a + b for a, b in zip(first, second)],
+                lambda: first_array + second_array),
+        'scale': (lambda: [a * 2.5 for a in first],
+                  lambda: first_array * 2.5),
+        'dot': (lambda: [a * b for a, b in zip(first, second)],
+                lambda: first_array.dot(second_array)),
+        'cross': (lambda: [a.cross(b) for a, b in zip(first, second)],
+                  lambda: first_array.cross(second_array)),
+        'norm': (lambda: [a.norm() for a in first],
+                 lambda: first_array.norm()),
+        'compare': (lambda: [a < b for a, b in zip(first, second)],
+                    lambda: first_array < second_array),
+    }
+
+    print(f'{size} 3D vectors')
+    print(f'{"operation":>10} {"objects s":>10} {"array s":>10} {"speedup":>8}')
+    for name, (per_object, vectorized) in operations.items():
+        start_time = time.perf_counter()
+        per_object()
+        object_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        vectorized()
+        array_time = time.perf_counter() - start_time
+        print(f'{name:>10} {object_time:>10.3f} {array_time:>10.3f} {object_time / array_time:>8.1f}')
 
 
 # ==============================================
 # Example Usage and Testing
 # ==============================================
-v1 = R3Vector(x=2, y=3, z=1)
-v2 = R3Vector(x=0.5, y=1.25, z=2)
+if __name__ == '__main__':
+    if sys.argv[1:] == ['benchmark']:
+        benchmark()
+        sys.exit()
+
+    v1 = R3Vector(x=2, y=3, z=1)
+    v2 = R3Vector(x=0.5, y=1.25, z=2)
 
-print(f'v1 = {v1}')          # Prints (2, 3, 1)
-print(f'v2 = {v2}')          # Prints (0.5, 1.25, 2)
+    print(f'v1 = {v1}')          # Prints (2, 3, 1)
+    print(f'v2 = {v2}')          # Prints (0.5, 1.25, 2)
 
-# Vector addition and subtraction
-v3 = v1 + v2
-print(f'v1 + v2 = {v3}')     # Component-wise addition
+    # Vector addition and subtraction
+    v3 = v1 + v2
+    print(f'v1 + v2 = {v3}')     # Component-wise addition
 
-v4 = v1 - v2
-print(f'v1 - v2 = {v4}')     # Component-wise subtraction
+    v4 = v1 - v2
+    print(f'v1 - v2 = {v4}')     # Component-wise subtraction
 
-# Dot product
-v5 = v1 * v2
-print(f'v1 * v2 = {v5}')     # Scalar result
+    # Dot product
+    v5 = v1 * v2
+    print(f'v1 * v2 = {v5}')     # Scalar result
 
-# Cross product
-v6 = v1.cross(v2)
-print(f'v1 x v2 = {v6}')     # 3D vector result of cross product
+    # Cross product
+    v6 = v1.cross(v2)
+    print(f'v1 x v2 = {v6}')     # 3D vector result of cross product
@@ -0,0 +1,31 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from Sudoko_Solver import HARD_PUZZLES, solve_batch
+
+class TestSolveBatch(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.directory.name, 'puzzles.txt')
+        self.output_path = os.path.join(self.directory.name, 'solutions.txt')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_invalid_lines_do_not_stop_the_batch(self):
+        puzzle = HARD_PUZZLES['Arto Inkala 2012']
+        with open(self.input_path, 'w') as input_file:
+            input_file.write('0' * 16 + '\n' + 'x' * 81 + '\n' + puzzle + '\n')
+        summary = solve_batch(self.input_path, self.output_path, workers=1, chunk_size=1)
+        with open(self.output_path) as output_file:
+            solutions = output_file.read().split()
+        self.assertEqual(solutions[:2], ['invalid', 'invalid'])
+        self.assertEqual(len(solutions[2]), 81)
+        self.assertTrue(all(a == '0' or a == b for a, b in zip(puzzle, solutions[2])))
+        self.assertEqual(summary['invalid'], 2)
+        self.assertEqual(summary['solved'], 1)
+
+if __name__ == "__main__":
+    unittest.main()